@@ -0,0 +1,71 @@
+import numpy as np
+
+# =====================================================
+# ---------------- Admin Table Query -------------------
+# =====================================================
+#
+# فهارس محسوبة مرة واحدة لكل نسخة بيانات:
+#   - لكل عمود فلترة: قيمة -> مواقع الصفوف
+#   - نص بحث واحد (اسم اللاعب + المدرب + الهاتف) بحروف صغيرة
+# وبعدها يتم إرسال صفحة واحدة فقط من النتائج إلى المتصفح.
+
+FILTER_COLS = ("Championship", "Federation", "Club", "Belt Degree", "Sex")
+SEARCH_COLS = ("Athlete Name", "Coach Name", "Phone Number")
+
+
+class AthleteIndex:
+    """Posting lists per filter column plus a lower-cased search haystack."""
+
+    def __init__(self, df):
+        self.df = df
+        self.size = len(df)
+        self.codes = {}
+        self.values = {}
+        self.postings = {}
+        for col in FILTER_COLS:
+            if col not in df.columns:
+                continue
+            codes, uniques = df[col].astype(str).factorize()
+            self.codes[col] = codes
+            self.values[col] = {v: i for i, v in enumerate(uniques)}
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            self.postings[col] = [order[bounds[i]:bounds[i + 1]] for i in range(len(uniques))]
+
+        if self.size:
+            hay = df[SEARCH_COLS[0]].astype(str)
+            for col in SEARCH_COLS[1:]:
+                hay = hay + "\x1f" + df[col].astype(str)
+            self.haystack = hay.str.lower().to_numpy()
+        else:
+            self.haystack = np.array([], dtype=object)
+
+    def options(self, col):
+        return sorted(v for v in self.values.get(col, {}) if v)
+
+    def query(self, filters=None, text=""):
+        """Return sorted row positions matching every filter and the search text."""
+        selected = []
+        for col, values in (filters or {}).items():
+            if values and col in self.values:
+                codes = [self.values[col][v] for v in values if v in self.values[col]]
+                selected.append((sum(len(self.postings[col][c]) for c in codes), col, codes))
+
+        if selected:
+            # نبدأ بأصغر فلتر ثم نفحص باقي الفلاتر على الصفوف الناتجة فقط
+            selected.sort(key=lambda item: item[0])
+            _, col, codes = selected[0]
+            hits = [self.postings[col][c] for c in codes]
+            rows = np.sort(np.concatenate(hits)) if hits else np.array([], dtype=np.intp)
+            for _, col, codes in selected[1:]:
+                rows = rows[np.isin(self.codes[col][rows], codes)]
+        else:
+            rows = np.arange(self.size)
+
+        text = text.strip().lower()
+        if text and len(rows):
+            # البحث فقط داخل الصفوف التي اجتازت الفلاتر
+            candidates = self.haystack[rows]
+            found = np.fromiter((text in h for h in candidates), dtype=bool, count=len(candidates))
+            rows = rows[found]
+        return rows
@@ -0,0 +1,67 @@
+import base64
+import io
+import os
+from pathlib import Path
+
+# =====================================================
+# ---------------- Logo Thumbnails ---------------------
+# =====================================================
+#
+# الشعارات تُعرض بعرض 80px فقط، لذلك نصغرها مرة واحدة عند بدء التشغيل
+# (ضعف العرض لشاشات retina) بصيغة WebP (أو PNG إذا كان Pillow بدون WebP).
+#   - مع server.enableStaticServing: تُكتب في static/ وتُخدم من /app/static (المتصفح يحفظها في الكاش)
+#   - بدونها: تُضمن في الصفحة كـ data URI
+# في الحالتين لا يتم تحميل الملفات الكاملة من GitHub.
+
+THUMB_WIDTH = 160
+WEBP_QUALITY = 85
+
+
+def _thumb_format():
+    from PIL import features
+    return ("webp", "image/webp") if features.check("webp") else ("png", "image/png")
+
+
+def thumbnail_bytes(path, width=THUMB_WIDTH):
+    """Return (extension, mime, bytes) of ``path`` resized to ``width`` px wide (never upscaled)."""
+    from PIL import Image
+
+    ext, mime = _thumb_format()
+    with Image.open(path) as image:
+        image = image.convert("RGBA")
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        buffer = io.BytesIO()
+        if ext == "webp":
+            image.save(buffer, "WEBP", quality=WEBP_QUALITY)
+        else:
+            image.save(buffer, "PNG", optimize=True)
+    return ext, mime, buffer.getvalue()
+
+
+def write_thumbnail(path, out_dir, width=THUMB_WIDTH):
+    """Write the thumbnail next to other static files; reused while newer than the source."""
+    path, out_dir = Path(path), Path(out_dir)
+    ext, _ = _thumb_format()
+    out = out_dir / f"{path.stem}_{width}.{ext}"
+    if out.exists() and out.stat().st_mtime >= path.stat().st_mtime:
+        return out
+
+    _, _, data = thumbnail_bytes(path, width)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, out)
+    return out
+
+
+def logo_src(path, fallback, static_dir=None, width=THUMB_WIDTH):
+    """``src`` for an <img>: static URL, inline data URI, or ``fallback`` if the file/Pillow is missing."""
+    try:
+        if static_dir is not None:
+            return f"app/static/{write_thumbnail(path, static_dir, width).name}"
+        _, mime, data = thumbnail_bytes(path, width)
+    except (ImportError, OSError) as e:
+        print("Logo thumbnail error:", e)
+        return fallback
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
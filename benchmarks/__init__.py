@@ -0,0 +1,11 @@
+# =====================================================
+# ---------------- Benchmarks --------------------------
+# =====================================================
+#
+# قياس أداء المسارات الساخنة (تحميل / تسجيل / تصدير) مع نمو عدد اللاعبين:
+#
+#   python -m benchmarks.run                          # 1k / 10k / 100k
+#   python -m benchmarks.run --sizes 1000 10000 --out bench.json
+#   python -m benchmarks.run --update-baseline        # حفظ النتائج كـ baseline جديد
+#
+#   python -m benchmarks.load_test --sessions 40 --concurrency 8 --players 5   # جلسات متزامنة على rr.py
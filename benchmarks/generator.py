@@ -0,0 +1,82 @@
+import random
+from datetime import date
+
+from options import BELT_OPTIONS, CHAMPIONSHIP_SPECS, SEX_ONLY_COMPETITIONS, SEX_OPTIONS
+from storage import COLUMNS
+
+# =====================================================
+# ---------------- Synthetic Athletes ------------------
+# =====================================================
+#
+# لاعبون وهميون بنفس شكل الصفوف التي يحفظها rr.py (نفس الأعمدة ونفس القوائم)
+# وبيانات صحيحة حتى يمر التحقق — نفس الـ seed يعطي نفس البيانات دائماً.
+
+NATIONALITIES = ("Egypt / مصر", "Libya / ليبيا", "Tunisia / تونس", "Sudan / السودان", "Morocco / المغرب")
+FIRST_NAMES = ("Ahmed", "Mohamed", "Omar", "Youssef", "Mariam", "Nour", "Salma", "Hana", "محمد", "أحمد", "منة", "فاطمة")
+LAST_NAMES = ("Hassan", "Ali", "Ibrahim", "Mahmoud", "Saleh", "Fathy", "حسن", "علي", "إبراهيم", "سالم")
+
+JUNIOR_BELTS = tuple(b for b in BELT_OPTIONS if b.startswith("Kyu Junior"))
+SENIOR_BELTS = tuple(b for b in BELT_OPTIONS if b.startswith("Kyu Senior"))
+DAN_BELTS = tuple(b for b in BELT_OPTIONS if b.startswith("Dan"))
+
+
+def _belt(rng, age):
+    # السن الفعلي age أو age + 1 حسب يوم الميلاد — الحزام يناسب الحالتين
+    if age <= 13:
+        return rng.choice(JUNIOR_BELTS)
+    if age <= 16:
+        return rng.choice(JUNIOR_BELTS + SENIOR_BELTS)
+    return rng.choice(SENIOR_BELTS + DAN_BELTS)
+
+
+SPECS = tuple(CHAMPIONSHIP_SPECS.values())
+
+_WRONG_SEX = {
+    sex: {c for c, only in SEX_ONLY_COMPETITIONS.items() if only != sex} for sex in SEX_OPTIONS
+}
+
+
+def _competitions(rng, spec, federation, sex):
+    options = [c for c in spec.competitions_for(federation) if c not in _WRONG_SEX[sex]]
+    return ", ".join(rng.sample(options, min(len(options), rng.randint(1, 3))))
+
+
+def make_athlete(rng, i, today=None):
+    today = today or date.today()
+    spec = rng.choice(SPECS)
+    federation = rng.choice(spec.federations) if spec.federations else ""
+    sex = rng.choice(SEX_OPTIONS)
+    # السن الفعلي age أو age + 1 — يبقى داخل age_range للبطولة إن وُجد
+    low, high = spec.age_range or (6, 56)
+    age = rng.randint(low, max(low, high - 1))
+    dob = date(today.year - age - 1, rng.randint(1, 12), rng.randint(1, 28))
+
+    athlete = {
+        "Championship": spec.stored_name(rng.choice(spec.courses) if spec.courses else ""),
+        "Athlete Name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+        "Club": f"Club {rng.randint(1, 300)}",
+        "Nationality": rng.choice(NATIONALITIES),
+        "Coach Name": f"Coach {rng.randint(1, 400)}",
+        "Phone Number": f"01{rng.choice('0125')}{rng.randint(0, 99_999_999):08d}",
+        "Date of Birth": dob.isoformat(),
+        "Sex": sex,
+        "Belt Degree": _belt(rng, age),
+        "Weight": "",
+        "Height": "",
+        "Competitions": "",
+        "Federation": federation,
+    }
+    if "Coach Name" not in spec.shared_fields + spec.player_fields:
+        athlete["Coach Name"] = ""
+    if spec.has_competitions:
+        athlete["Competitions"] = _competitions(rng, spec, federation, sex)
+    if federation in spec.weight_height:
+        athlete["Weight"] = str(round(rng.uniform(35, 110), 1))
+        athlete["Height"] = str(rng.randint(145, 200))
+    return athlete
+
+
+def make_athletes(n, seed=0, start=0):
+    """``n`` athletes as dicts with the storage column order; deterministic for a given seed."""
+    rng = random.Random(seed)
+    return [{c: a[c] for c in COLUMNS} for a in (make_athlete(rng, i) for i in range(start, start + n))]
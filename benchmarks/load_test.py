@@ -0,0 +1,253 @@
+import argparse
+import importlib
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from benchmarks.generator import make_athlete
+from benchmarks.sheet_stub import SheetStub
+from options import CHAMPIONSHIP_SPECS, SHARED_FIELDS
+from sheet_sync import Outbox, SheetSyncWorker
+from storage import COLUMNS, CsvStore
+
+# =====================================================
+# ---------------- Concurrent Load Test ----------------
+# =====================================================
+#
+# عدة جلسات متزامنة تشغل rr.py الحقيقي عبر streamlit AppTest:
+#   اختيار البطولة -> ملء N لاعبين -> Submit All
+# داخل مجلد مؤقت (ملف بيانات و outbox جديدان) ومع stub محلي بدلاً من جوجل شيت.
+# AppTest يستخدم Runtime واحد لكل عملية، لذلك كل جلسة متزامنة تعمل في عملية منفصلة
+# (وهذا يختبر أيضاً قفل الملفات بين العمليات).
+# في النهاية: زمن كل rerun وكل submit (p50/p95/p99)، عدد التسجيلات في الثانية،
+# واللاعبين المفقودين أو المكررين في ملف البيانات وفي الـ stub.
+#
+#   python -m benchmarks.load_test --sessions 40 --concurrency 20 --players 5
+
+APP_FILE = Path(__file__).resolve().parent.parent / "rr.py"
+APP_TIMEOUT = 120           # ثواني لكل rerun — الجلسات تتنافس على نفس العملية
+
+# بطولات النموذج الكامل فقط (بيانات مشتركة لكل اللاعبين + اتحاد) — الكورسات لها حقول مختلفة
+FORM_CHAMPIONSHIPS = tuple(
+    name for name, spec in CHAMPIONSHIP_SPECS.items()
+    if set(spec.shared_fields) == set(SHARED_FIELDS) and spec.federations and spec.has_competitions and not spec.courses
+)
+
+
+def percentiles(values):
+    if not values:
+        return {}
+    values = sorted(values)
+    pick = lambda q: values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+    return {
+        "count": len(values),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": values[-1],
+        "mean": statistics.fmean(values),
+    }
+
+
+def _run(at, timings):
+    start = time.perf_counter()
+    at.run()
+    timings.append(time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def _text_input(at, label_prefix):
+    return next(w for w in at.text_input if w.label.startswith(label_prefix))
+
+
+def run_session(session_id, players, seed):
+    """One coach: pick a championship, fill ``players`` athletes, Submit All.
+
+    Returns (athlete names, rerun seconds, submit seconds).
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_id)
+    championship = rng.choice(FORM_CHAMPIONSHIPS)
+    spec = CHAMPIONSHIP_SPECS[championship]
+    athletes = []
+    while len(athletes) < players:
+        a = make_athlete(rng, f"s{session_id}-{len(athletes)}")
+        if a["Championship"] == championship:
+            athletes.append(a)
+
+    reruns, submits = [], []
+    at = AppTest.from_file(str(APP_FILE), default_timeout=APP_TIMEOUT)
+    _run(at, reruns)
+    at.selectbox[0].set_value(championship)
+    at.button[0].click()
+    _run(at, reruns)
+
+    first = athletes[0]
+    _text_input(at, "Enter Club").input(first["Club"])
+    _text_input(at, "Enter Nationality").input(first["Nationality"])
+    _text_input(at, "Enter Coach Name").input(first["Coach Name"])
+    _text_input(at, "Enter Phone Number").input(first["Phone Number"])
+    at.number_input[0].set_value(players)
+    _run(at, reruns)
+
+    sc = 0
+    for i, a in enumerate(athletes):
+        at.text_input(key=f"name_{sc}_{i}").input(a["Athlete Name"])
+        at.date_input(key=f"dob_{sc}_{i}").set_value(date.fromisoformat(a["Date of Birth"]))
+        at.selectbox(key=f"sex_{sc}_{i}").set_value(a["Sex"])
+        at.selectbox(key=f"belt_{sc}_{i}").set_value(a["Belt Degree"])
+        at.selectbox(key=f"fed_{sc}_{i}").set_value(a["Federation"])
+    _run(at, reruns)
+
+    for i, a in enumerate(athletes):
+        if a["Federation"] in spec.weight_height:
+            at.number_input(key=f"weight_{sc}_{i}").set_value(float(a["Weight"]))
+            at.number_input(key=f"height_{sc}_{i}").set_value(int(a["Height"]))
+        at.multiselect(key=f"comp_{sc}_{i}").set_value(a["Competitions"].split(", "))
+    _run(at, reruns)
+
+    next(b for b in at.button if b.label.startswith("Submit All")).click()
+    _run(at, submits)
+    if not at.success:
+        errors = [e.value for e in at.error] + [m.value for m in at.markdown if m.value.startswith("•")]
+        raise RuntimeError(f"session {session_id}: submit failed {errors[:3]}")
+    return [a["Athlete Name"] for a in athletes], reruns, submits
+
+
+def _wait_for_outbox(outbox, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = outbox.status()
+        if not status["pending"]:
+            return status
+        time.sleep(0.5)
+    return outbox.status()
+
+
+def _stop_sheet_workers():
+    # يكمل الـ worker الدفعة الحالية ثم يتوقف — وإلا يُقتل بين الإرسال و mark_sent فيتكرر الإرسال
+    for thread in threading.enumerate():
+        if thread.name == "sheet-sync":
+            thread.stop()
+            thread.join(timeout=30)
+
+
+def _init_process():
+    multiprocessing.util.Finalize(None, _stop_sheet_workers, exitpriority=10)
+
+
+def run(sessions, concurrency, players, seed=0, sheet_latency=0.0, sheet_failure_rate=0.0, drain_timeout=60):
+    workdir = Path(tempfile.mkdtemp(prefix="karate-load-"))
+    cwd = os.getcwd()
+    expected, reruns, submits, failures = [], [], [], []
+    try:
+        # rr.py يستخدم مسارات نسبية (athletes_data.csv / sheet_outbox.sqlite3)
+        os.chdir(workdir)
+        with SheetStub(latency=sheet_latency, failure_rate=sheet_failure_rate) as stub:
+            os.environ["GOOGLE_SHEET_API"] = stub.url
+            start = time.perf_counter()
+            # AppTest يضع rr.py مكان __main__ — نرسل الدالة باسم الـ module الحقيقي
+            session = importlib.import_module("benchmarks.load_test").run_session
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(concurrency, mp_context=context, initializer=_init_process) as pool:
+                futures = [pool.submit(session, s, players, seed) for s in range(sessions)]
+                for f in futures:
+                    try:
+                        names, session_reruns, session_submits = f.result()
+                    except Exception as e:
+                        failures.append(str(e))
+                        continue
+                    expected.extend(names)
+                    reruns.extend(session_reruns)
+                    submits.extend(session_submits)
+            wall = time.perf_counter() - start
+
+            # ما تبقى في الـ outbox بعد انتهاء العمليات يرسله worker واحد هنا
+            worker = SheetSyncWorker(Outbox(), stub.url, poll_interval=0.2)
+            worker.start()
+            sheet = _wait_for_outbox(worker.outbox, drain_timeout)
+            worker.stop()
+            worker.join()
+
+            stored = Counter(CsvStore(workdir / "athletes_data.csv", COLUMNS).load()["Athlete Name"])
+            in_sheet = Counter(row.get("Athlete Name") for row in stub.rows)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "players_per_session": players,
+        "failed_sessions": len(failures),
+        "errors": failures[:10],
+        "wall_seconds": wall,
+        "throughput_players_per_s": len(expected) / wall if wall else 0.0,
+        "rerun_latency_s": percentiles(reruns),
+        "submit_latency_s": percentiles(submits),
+        "data_file": {
+            "expected": len(expected),
+            "lost": sum(1 for name in expected if not stored[name]),
+            "duplicated": sum(n - 1 for n in stored.values() if n > 1),
+        },
+        "sheet": {
+            "received": sum(in_sheet.values()),
+            "lost": sum(1 for name in expected if not in_sheet[name]),
+            "duplicated": sum(n - 1 for n in in_sheet.values() if n > 1),
+            "pending": sheet["pending"],
+            "stub_failures": stub.failures,
+        },
+    }
+
+
+def _print_report(report):
+    print(f"{report['sessions']} sessions × {report['players_per_session']} players, "
+          f"concurrency {report['concurrency']} — {report['wall_seconds']:.1f}s, "
+          f"{report['throughput_players_per_s']:.1f} players/s, {report['failed_sessions']} failed sessions")
+    for name in ("rerun_latency_s", "submit_latency_s"):
+        p = report[name]
+        if p:
+            print(f"  {name:<17} p50 {p['p50'] * 1000:7.0f}ms  p95 {p['p95'] * 1000:7.0f}ms  "
+                  f"p99 {p['p99'] * 1000:7.0f}ms  (n={p['count']})")
+    d, s = report["data_file"], report["sheet"]
+    print(f"  data file: {d['expected']} expected, {d['lost']} lost, {d['duplicated']} duplicated")
+    print(f"  sheet:     {s['received']} received, {s['lost']} lost, {s['duplicated']} duplicated, {s['pending']} pending")
+    for e in report["errors"]:
+        print("  !", e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive rr.py with many simultaneous AppTest sessions.")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--players", type=int, default=3, help="players per Submit All")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sheet-latency", type=float, default=0.0, help="seconds the stub waits per POST")
+    parser.add_argument("--sheet-failure-rate", type=float, default=0.0)
+    parser.add_argument("--json", type=Path, help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.sessions, args.concurrency, args.players, args.seed, args.sheet_latency, args.sheet_failure_rate)
+    _print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    ok = not report["failed_sessions"] and not report["data_file"]["lost"] and not report["data_file"]["duplicated"]
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
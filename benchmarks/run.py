@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.generator import make_athletes
+from divisions import DivisionIndex, assign, division_counts
+from duplicates import IdentityIndex
+from export import to_csv_bytes, to_excel_bytes
+from registration import save_athletes
+from sheet_sync import Outbox
+from storage import COLUMNS, CsvStore
+from validation import validate_batch
+
+# =====================================================
+# ---------------- Benchmark Runner --------------------
+# =====================================================
+#
+# rr.py سكريبت Streamlit ولا يمكن استيراده، لذلك نقيس نفس الدوال التي يستدعيها؛
+# الحفظ هو save_athletes نفسها التي يستدعيها save_data. كل حجم بيانات يعمل في مجلد مؤقت خاص به.
+# جوجل شيت غير مستخدم: التسجيل يضيف للـ outbox فقط (بدون worker).
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+SUBMIT_BATCH = 10           # عدد اللاعبين في كل "Submit All"
+TOLERANCE = 0.5             # أبطأ من الـ baseline بأكثر من 50% = تراجع
+NOISE_FLOOR = 0.005         # فروق أقل من 5ms لا تُحسب
+
+
+def _timed(fn, repeats, setup=None):
+    runs = []
+    for _ in range(repeats):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        fn(state)
+        runs.append(time.perf_counter() - start)
+    return {"median": statistics.median(runs), "min": min(runs), "runs": repeats}
+
+
+def bench_size(n, repeats, workdir):
+    os.chdir(workdir)
+    data_file = Path("athletes_data.csv")
+    athletes = make_athletes(n, seed=n)
+    store = CsvStore(data_file, COLUMNS, compact_bytes=float("inf"))
+    store.append(athletes)
+    store.compact()
+    results = {}
+
+    # ---------------- load_data ----------------
+    def drop_snapshot():
+        store.snapshot_path.unlink(missing_ok=True)
+
+    results["load_csv"] = _timed(lambda _: CsvStore(data_file, COLUMNS).load(), repeats, drop_snapshot)
+    results["load_snapshot"] = _timed(lambda _: CsvStore(data_file, COLUMNS).load(), repeats)
+
+    # ---------------- submit (validate + save_data + next rerun's load) ----------------
+    identity = IdentityIndex()
+    identity.sync(store.load())
+    divisions = DivisionIndex()
+    divisions.sync(store.load())
+    outbox = Outbox("sheet_outbox.sqlite3")
+    batches = iter(make_athletes(SUBMIT_BATCH, seed=n + 1 + i, start=n + i * SUBMIT_BATCH) for i in range(repeats))
+
+    def submit(batch):
+        errors = validate_batch(pd.DataFrame(batch))
+        assert errors.empty, errors.head()
+        assert not save_athletes(batch, store, identity, outbox, divisions)
+        store.load()
+
+    results["submit"] = _timed(submit, repeats, lambda: next(batches))
+    results["validate"] = _timed(lambda _: validate_batch(pd.DataFrame(athletes)), repeats)
+
+    # ---------------- admin divisions / export ----------------
+    df = store.load()
+    results["divisions"] = _timed(lambda _: division_counts(assign(df)), repeats)
+    results["export_xlsx"] = _timed(lambda _: to_excel_bytes(df), repeats)
+    results["export_xlsx_split"] = _timed(lambda _: to_excel_bytes(df, "Championship"), repeats)
+    results["export_csv"] = _timed(lambda _: to_csv_bytes(df), repeats)
+    return results
+
+
+def run(sizes, repeats=None):
+    results = {}
+    cwd = os.getcwd()
+    try:
+        for n in sizes:
+            with tempfile.TemporaryDirectory(prefix=f"karate-bench-{n}-") as workdir:
+                print(f"→ {n:,} athletes", file=sys.stderr)
+                results[str(n)] = bench_size(n, repeats or (5 if n <= 10_000 else 2), workdir)
+    finally:
+        os.chdir(cwd)
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=TOLERANCE):
+    """Rows of (size, case, baseline s, current s, ratio, regressed) for cases present in both."""
+    rows = []
+    for size, cases in current["results"].items():
+        for case, timing in cases.items():
+            base = baseline.get("results", {}).get(size, {}).get(case)
+            if base is None:
+                continue
+            now, before = timing["median"], base["median"]
+            ratio = now / before if before else float("inf")
+            regressed = now - before > NOISE_FLOOR and ratio > 1 + tolerance
+            rows.append((size, case, before, now, ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time load / submit / export at several data sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, help="runs per case (default 5, or 2 above 10k rows)")
+    parser.add_argument("--out", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="save these results as the baseline")
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.repeat)
+    args.out.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    print(f"Results written to {args.out}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline} — run with --update-baseline to create one")
+        return 0
+
+    rows = compare(current, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+    print(f"{'size':>8}  {'case':<18} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for size, case, before, now, ratio, regressed in rows:
+        flag = "  ✗ slower" if regressed else ""
+        print(f"{int(size):>8,}  {case:<18} {before * 1000:>8.1f}ms {now * 1000:>8.1f}ms {ratio:>6.2f}x{flag}")
+    regressions = sum(r[-1] for r in rows)
+    print(f"{regressions} regression(s) beyond {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
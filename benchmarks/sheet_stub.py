@@ -0,0 +1,82 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# =====================================================
+# ---------------- Local Google Sheet Stub -------------
+# =====================================================
+#
+# بديل محلي لـ Apps Script endpoint: يستقبل POST بلاعب واحد (JSON) ويحفظه في الذاكرة،
+# و GET ?action=rows يرجع كل الصفوف المحفوظة (للـ reconciliation).
+# latency و failure_rate لمحاكاة بطء جوجل أو أعطاله أثناء اختبار الضغط.
+
+
+class SheetStub:
+    """In-memory stand-in for GOOGLE_SHEET_API, served on 127.0.0.1."""
+
+    def __init__(self, latency=0.0, failure_rate=0.0, port=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rows = []
+        self.requests = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/exec"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if stub.latency:
+                    time.sleep(stub.latency)
+                with stub.lock:
+                    stub.requests += 1
+                    failed = random.random() < stub.failure_rate
+                    if failed:
+                        stub.failures += 1
+                    else:
+                        stub.rows.append(json.loads(body or b"{}"))
+                self.send_response(500 if failed else 200)
+                self.send_header("Content-Type", "text/plain")
+                self.end_headers()
+                self.wfile.write(b"error" if failed else b"ok")
+
+            def do_GET(self):
+                with stub.lock:
+                    body = json.dumps({"rows": list(stub.rows)}, ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="sheet-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,181 @@
+import re
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from frames import as_text
+from options import SEX_OPTIONS
+
+# =====================================================
+# ---------------- Divisions / Brackets ----------------
+# =====================================================
+#
+# الفئة (division) = البطولة × الاتحاد × المسابقة × الجنس × الفئة العمرية × مستوى الحزام × فئة الوزن
+# تُحسب لكل الجدول مرة واحدة بعمليات vectorized (لاعب واحد = فئة لكل مسابقة اختارها).
+# DivisionIndex يحتفظ بعدد اللاعبين في كل فئة ويضيف الصفوف الجديدة فقط بعد كل save_data.
+
+DIVISION_COLS = ["Championship", "Federation", "Competition", "Sex", "Age Group", "Belt Band", "Weight Class"]
+
+# السن في يوم البطولة: [من, إلى)
+AGE_EDGES = (0, 8, 10, 12, 14, 16, 18, 21, 35, 200)
+AGE_GROUPS = ("U8", "8-9", "10-11", "12-13", "14-15", "16-17", "18-20", "21-34", "35+")
+
+# الوزن فقط في الكوميتيه الفردي ولمن أدخل وزنه (لجنة الجنرال)
+WEIGHT_LIMITS = {
+    SEX_OPTIONS[0]: (55, 60, 67, 75, 84),
+    SEX_OPTIONS[1]: (50, 55, 61, 68),
+}
+OPEN_WEIGHT = "Open"
+
+_KYU = re.compile(r"^Kyu \D*(\d+)")
+_DAN = re.compile(r"^Dan (\d+)")
+
+
+def belt_band(belt):
+    kyu = _KYU.match(belt)
+    if kyu:
+        n = int(kyu.group(1))
+        return "Kyu 10-7" if n >= 7 else "Kyu 6-4" if n >= 4 else "Kyu 3-1"
+    dan = _DAN.match(belt)
+    if dan:
+        return "Dan 1-2" if int(dan.group(1)) <= 2 else "Dan 3+"
+    return ""
+
+
+def is_weighted(competition):
+    return "Kumite" in competition and "Team" not in competition
+
+
+def _weight_classes(sex, weight):
+    out = np.full(len(sex), OPEN_WEIGHT, dtype=object)
+    for value, limits in WEIGHT_LIMITS.items():
+        mask = (sex == value) & ~np.isnan(weight)
+        if not mask.any():
+            continue
+        labels = np.array([f"-{w} kg" for w in limits] + [f"+{limits[-1]} kg"], dtype=object)
+        out[mask] = labels[np.searchsorted(limits, weight[mask], side="left")]
+    return out
+
+
+def _ages(dob, on):
+    if not pd.api.types.is_datetime64_any_dtype(dob):
+        dob = pd.to_datetime(as_text(dob).str[:10], errors="coerce", format="%Y-%m-%d")
+    before_birthday = (dob.dt.month > on.month) | ((dob.dt.month == on.month) & (dob.dt.day > on.day))
+    return (on.year - dob.dt.year - before_birthday.astype(int)).to_numpy(dtype=float, na_value=np.nan)
+
+
+def _explode_competitions(series):
+    # التقسيم على القيم المختلفة فقط (عدد قليل من التوليفات) ثم التوزيع على الصفوف بالأكواد
+    codes, uniques = pd.factorize(series)
+    parts = [[c.strip() for c in str(u).split(",") if c.strip()] for u in uniques] + [[]]   # -1 = فارغ
+    lengths = np.array([len(p) for p in parts])
+    flat = np.array([c for p in parts for c in p] or [""], dtype=object)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    per_row = lengths[codes]
+    rows = np.repeat(np.arange(len(codes)), per_row)
+    within = np.arange(len(rows)) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+    return rows, flat[offsets[codes[rows]] + within] if len(rows) else np.array([], dtype=object)
+
+
+def assign(df, on=None, start=0):
+    """One row per (athlete, competition) with its division columns; ``Row`` = position + ``start``."""
+    on = on or date.today()
+    if df.empty:
+        return pd.DataFrame(columns=["Row"] + DIVISION_COLS)
+    df = df.reset_index(drop=True)
+
+    rows, competition = _explode_competitions(df["Competitions"])
+
+    age = _ages(df["Date of Birth"], on)
+    group = np.searchsorted(AGE_EDGES, age, side="right") - 1
+    age_group = np.where(np.isnan(age) | (group < 0) | (group >= len(AGE_GROUPS)), "",
+                         np.array(AGE_GROUPS + ("",), dtype=object)[np.clip(group, 0, len(AGE_GROUPS))])
+
+    belt = as_text(df["Belt Degree"])
+    bands = {b: belt_band(b) for b in belt.unique()}
+    sex = as_text(df["Sex"]).to_numpy(dtype=object)
+    weight = pd.to_numeric(df["Weight"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    weights = _weight_classes(sex, weight)[rows]
+    weighted = pd.Series(competition).map({c: is_weighted(c) for c in set(competition)}).to_numpy(dtype=bool)
+
+    return pd.DataFrame({
+        "Row": rows + start,
+        "Championship": as_text(df["Championship"]).to_numpy(dtype=object)[rows],
+        "Federation": as_text(df["Federation"]).to_numpy(dtype=object)[rows],
+        "Competition": competition,
+        "Sex": sex[rows],
+        "Age Group": age_group[rows],
+        "Belt Band": belt.map(bands).to_numpy(dtype=object)[rows],
+        "Weight Class": np.where(weighted, weights, OPEN_WEIGHT),
+    })
+
+
+def division_counts(assigned):
+    if assigned.empty:
+        return {}
+    return assigned.groupby(DIVISION_COLS, sort=False).size().to_dict()
+
+
+class DivisionIndex:
+    """Athletes per division, extended with appended rows only (the data is append-only)."""
+
+    def __init__(self, on=None):
+        self.on = on or date.today()
+        self.lock = threading.Lock()
+        self.counts = {}
+        self.size = 0
+
+    def sync(self, df):
+        with self.lock:
+            if len(df) < self.size:
+                self.counts, self.size = {}, 0
+            if len(df) == self.size:
+                return
+            new = division_counts(assign(df.iloc[self.size:], self.on, start=self.size))
+            for key, n in new.items():
+                self.counts[key] = self.counts.get(key, 0) + n
+            self.size = len(df)
+
+    def sizes(self):
+        """Frame of every division and its athlete count."""
+        with self.lock:
+            items = list(self.counts.items())
+        if not items:
+            return pd.DataFrame(columns=DIVISION_COLS + ["Athletes"])
+        sizes = pd.DataFrame([key for key, _ in items], columns=DIVISION_COLS)
+        sizes["Athletes"] = [n for _, n in items]
+        return sizes.sort_values(DIVISION_COLS, ignore_index=True)
+
+
+# ---------------- Draw Sheets ----------------
+
+DRAW_COLS = ["Athlete Name", "Club", "Nationality", "Coach Name", "Date of Birth", "Belt Degree", "Weight"]
+
+
+def _english(values):
+    return values.str.split(" / ", n=1, regex=False).str[0].str.strip()
+
+
+def draw_sheet(df, on=None, seed=0):
+    """Athletes grouped by division with a seeded random draw order (``Draw #``) inside each."""
+    assigned = assign(df, on)
+    if assigned.empty:
+        return pd.DataFrame(columns=["Championship", "Division", "Draw #"] + DRAW_COLS)
+
+    label = _english(assigned["Federation"].where(assigned["Federation"] != "", "-"))
+    for col in ("Competition", "Sex", "Age Group", "Belt Band", "Weight Class"):
+        label = label + " | " + _english(assigned[col])
+
+    athletes = df.reset_index(drop=True).iloc[assigned["Row"].to_numpy()][DRAW_COLS].reset_index(drop=True)
+    sheet = pd.concat([
+        pd.DataFrame({"Championship": assigned["Championship"].to_numpy(), "Division": label.to_numpy()}),
+        athletes.assign(**{"Date of Birth": as_text(athletes["Date of Birth"])}),
+    ], axis=1)
+
+    sheet["_order"] = np.random.default_rng(seed).random(len(sheet))
+    sheet = sheet.sort_values(["Championship", "Division", "_order"], ignore_index=True)
+    sheet.insert(2, "Draw #", sheet.groupby(["Championship", "Division"], sort=False).cumcount() + 1)
+    return sheet.drop(columns="_order")
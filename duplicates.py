@@ -0,0 +1,86 @@
+import hashlib
+import re
+import threading
+import unicodedata
+
+import pandas as pd
+
+from frames import as_text
+
+# =====================================================
+# ---------------- Duplicate Detection -----------------
+# =====================================================
+#
+# مفتاح هوية لكل لاعب = hash(الاسم + تاريخ الميلاد + البطولة) بعد التوحيد
+# (حروف صغيرة، مسافات موحدة، بدون تشكيل، أشكال الألف/الياء/التاء المربوطة موحدة).
+# الفهرس يُبنى مرة واحدة ثم يُمدّد بالصفوف الجديدة فقط (البيانات append-only).
+
+IDENTITY_COLS = ("Athlete Name", "Date of Birth", "Championship")
+
+_DIACRITICS = re.compile(r"[\u064B-\u065F\u0670\u0640]")     # تشكيل + تطويل
+_ARABIC_FORMS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ى": "ي", "ة": "ه"})
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(value):
+    text = unicodedata.normalize("NFKC", str(value)).casefold()
+    text = _DIACRITICS.sub("", text).translate(_ARABIC_FORMS)
+    return _SPACES.sub(" ", text).strip()
+
+
+def identity_key(name, dob, championship):
+    raw = "\x1f".join((normalize(name), str(dob).strip()[:10], normalize(championship)))
+    return int.from_bytes(hashlib.blake2b(raw.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def identity_keys(df):
+    if df.empty:
+        return []
+    cols = [as_text(df[c]) for c in IDENTITY_COLS]
+    return [identity_key(n, d, c) for n, d, c in zip(*cols)]
+
+
+class IdentityIndex:
+    """Hash index: identity key -> row positions in the store's frame."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.rows = {}
+        self.size = 0
+
+    def sync(self, df):
+        """Index rows appended since the last call (full rebuild if the data shrank)."""
+        with self.lock:
+            if len(df) < self.size:
+                self.rows, self.size = {}, 0
+            if len(df) == self.size:
+                return
+            for pos, key in enumerate(identity_keys(df.iloc[self.size:]), start=self.size):
+                self.rows.setdefault(key, []).append(pos)
+            self.size = len(df)
+
+    def check(self, players):
+        """Return {batch position: reason} for players already registered or repeated in the batch."""
+        found = {}
+        seen = set()
+        for i, p in enumerate(players):
+            key = identity_key(p.get("Athlete Name", ""), p.get("Date of Birth", ""), p.get("Championship", ""))
+            if key in self.rows:
+                found[i] = "already registered / مسجل بالفعل"
+            elif key in seen:
+                found[i] = "repeated in this submission / مكرر في نفس الإرسال"
+            seen.add(key)
+        return found
+
+    def duplicate_rows(self):
+        """Row positions of every identity registered more than once, grouped together."""
+        with self.lock:
+            groups = [rows for rows in self.rows.values() if len(rows) > 1]
+        return [pos for rows in groups for pos in rows], len(groups)
+
+
+def duplicates_frame(df, index):
+    positions, groups = index.duplicate_rows()
+    if not positions:
+        return pd.DataFrame(columns=df.columns), 0
+    return df.iloc[[p for p in positions if p < len(df)]], groups
@@ -0,0 +1,66 @@
+import io
+import re
+
+from frames import as_cells
+
+# =====================================================
+# ---------------- Admin Export ------------------------
+# =====================================================
+#
+# التصدير يتم فقط عند الطلب، و openpyxl في وضع write_only
+# يكتب الصفوف بشكل متتابع بدلاً من بناء الـ workbook كاملاً في الذاكرة.
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MIME = "text/csv"
+
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+def sheet_title(value, used):
+    """Excel sheet names: max 31 chars, no []:*?/\\ and unique in the workbook."""
+    title = str(value).strip()
+    if len(title) > 31:
+        # الجزء الإنجليزي فقط (قبل " / ") لأسماء أقصر
+        title = title.split(" / ")[0]
+    title = _INVALID_SHEET_CHARS.sub("-", title)[:31].strip() or "Blank"
+    base, n = title, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+
+def _write_sheet(ws, df):
+    ws.append(list(df.columns))
+    for row in zip(*(as_cells(df[col]) for col in df.columns)):
+        ws.append(row)
+
+
+def to_excel_bytes(df, split_by=None):
+    """Build an .xlsx with openpyxl's write-only mode.
+
+    ``split_by`` is a column name (e.g. "Championship" or "Federation");
+    when given, every distinct value gets its own sheet.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    if split_by is None or df.empty:
+        _write_sheet(wb.create_sheet("Athletes"), df)
+    else:
+        used = set()
+        for value, group in df.groupby(split_by, sort=True, dropna=False, observed=True):
+            _write_sheet(wb.create_sheet(sheet_title(value, used)), group)
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def to_csv_bytes(df):
+    # utf-8-sig حتى يفتح Excel الأحرف العربية بشكل صحيح
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding="utf-8-sig")
+    return buffer.getvalue()
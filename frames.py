@@ -0,0 +1,82 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from options import BELT_OPTIONS, CHAMPIONSHIPS, FEDERATIONS, SEX_OPTIONS, STORED_CHAMPIONSHIPS
+
+# =====================================================
+# ---------------- Typed In-Memory Frame ---------------
+# =====================================================
+#
+# الأعمدة ذات القيم المتكررة تُخزن كـ categorical (كود صغير لكل صف بدلاً من نص ثنائي اللغة)
+# والوزن/الطول/تاريخ الميلاد كأعمدة رقمية وتاريخ.
+# القيم غير الموجودة في القوائم المعروفة تُضاف كفئات إضافية — لا يتم فقد أي قيمة.
+
+CATEGORY_VOCAB = {
+    "Championship": ("",) + tuple(dict.fromkeys(CHAMPIONSHIPS + tuple(STORED_CHAMPIONSHIPS))),
+    "Federation": ("",) + FEDERATIONS,
+    "Belt Degree": ("",) + BELT_OPTIONS,
+    "Sex": ("",) + SEX_OPTIONS,
+    "Nationality": ("",),
+    "Club": ("",),
+    "Coach Name": ("",),
+    "Competitions": ("",),
+}
+
+
+def _categorical(values, vocab):
+    extra = sorted(set(pd.unique(values)) - set(vocab))
+    return pd.Categorical(values, categories=list(vocab) + extra)
+
+
+def typed(df):
+    """Return ``df`` with categorical, numeric and date columns (input frame is all text)."""
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in CATEGORY_VOCAB:
+            out[col] = _categorical(s.fillna("").astype(str).to_numpy(dtype=object), CATEGORY_VOCAB[col])
+        elif col == "Weight":
+            out[col] = pd.to_numeric(s, errors="coerce").astype("float32")
+        elif col == "Height":
+            out[col] = pd.to_numeric(s, errors="coerce").round().astype("Int16")
+        elif col == "Date of Birth":
+            out[col] = pd.to_datetime(s.astype(str).str[:10], errors="coerce", format="%Y-%m-%d")
+        else:
+            out[col] = s.fillna("").astype(str).to_numpy(dtype=object)
+    return pd.DataFrame(out, index=df.index)
+
+
+def concat_typed(frames):
+    """``pd.concat`` that keeps categorical columns categorical (categories are unioned)."""
+    frames = [f for f in frames if f is not None and len(f.columns)]
+    if not frames:
+        return None
+    if len(frames) == 1:
+        return frames[0]
+    columns = list(dict.fromkeys(c for f in frames for c in f.columns))
+    frames = [f.reindex(columns=columns) if list(f.columns) != columns else f for f in frames]
+    out = {}
+    for col in columns:
+        parts = [f[col] for f in frames]
+        if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+            out[col] = union_categoricals([p.array for p in parts])
+        else:
+            out[col] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(out)
+
+
+def as_text(series):
+    """String form of a typed column, e.g. for hashing or text search."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime("%Y-%m-%d").fillna("")
+    return series.astype(str).where(series.notna(), "")
+
+
+def as_cells(series):
+    """Plain Python values for writers like openpyxl: text dates, rounded floats, None for missing."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.strftime("%Y-%m-%d")
+    elif pd.api.types.is_float_dtype(series):
+        # float32 -> float64 يضيف كسور وهمية (70.1 -> 70.0999…)
+        series = series.astype("float64").round(3)
+    return series.astype(object).where(series.notna(), None).tolist()
@@ -0,0 +1,101 @@
+import os
+import sys
+import threading
+import tracemalloc
+
+# =====================================================
+# ---------------- Memory Report -----------------------
+# =====================================================
+#
+# لتقدير حجم السيرفر لعدد كبير من الجلسات:
+#   - RSS للعملية وحجم session_state للجلسة الحالية (دائماً، رخيص)
+#   - tracemalloc snapshots (أكبر أماكن الحجز والفرق عن الـ snapshot السابق) — فقط مع KARATE_TRACEMALLOC=1
+#     لأن التتبع يبطئ كل عمليات الحجز في العملية.
+
+TOP_LIMIT = 15
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def rss_bytes():
+    """Current resident set size (Linux /proc), else the peak from getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def deep_size(obj, seen=None):
+    """Approximate bytes held by ``obj`` and everything it references (containers, __dict__, __slots__)."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj, 0)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if slot != "__weakref__" and hasattr(obj, slot):
+            size += deep_size(getattr(obj, slot), seen)
+    return size
+
+
+def _rows(stats, limit):
+    return [
+        {
+            "Location": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+            "Size KB": round(s.size / 1024, 1),
+            "Δ KB": round(getattr(s, "size_diff", 0) / 1024, 1),
+            "Count": s.count,
+        }
+        for s in stats[:limit]
+    ]
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots on demand; keeps the previous one to report growth."""
+
+    def __init__(self, enabled=False, frames=1):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.previous = None
+        self.last = None
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def traced(self):
+        """(current, peak) bytes allocated by Python since tracing started."""
+        return tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+
+    def take(self):
+        if not self.enabled:
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        with self.lock:
+            self.previous, self.last = self.last, snapshot
+
+    def top(self, limit=TOP_LIMIT):
+        """Largest allocation sites in the last snapshot."""
+        with self.lock:
+            if self.last is None:
+                return []
+            return _rows(self.last.statistics("lineno"), limit)
+
+    def growth(self, limit=TOP_LIMIT):
+        """Allocation sites that changed the most between the previous and the last snapshot."""
+        with self.lock:
+            if self.last is None or self.previous is None:
+                return []
+            return _rows(self.last.compare_to(self.previous, "lineno"), limit)
@@ -0,0 +1,145 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+# =====================================================
+# ---------------- Stage Timing Metrics ----------------
+# =====================================================
+#
+# زمن كل مرحلة (rerun كامل، load_data، التحقق، save_data، كل POST لجوجل شيت...)
+# يُجمع في histogram ثابت الحدود — الذاكرة ثابتة مهما زاد عدد الـ reruns.
+# عند التعطيل: stage() يرجع nullcontext مشترك و observe() يرجع فوراً.
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+EXPORT_INTERVAL = 10.0          # ثواني بين كتابة ملف المقاييس
+
+_DISABLED = nullcontext()
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus style) plus sum / max."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)      # الأخير = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Estimate from the buckets (linear inside the bucket, capped at the observed max)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                low = self.buckets[i - 1] if i else 0.0
+                high = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(self.max, low + (high - low) * (rank - seen) / n)
+            seen += n
+        return self.max
+
+
+class StageMetrics:
+    """Thread-safe registry of per-stage timing histograms."""
+
+    def __init__(self, enabled=False, export_path=None):
+        self.enabled = enabled
+        self.export_path = Path(export_path) if export_path else None
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._last_export = 0.0
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._histograms.get(stage)
+            if hist is None:
+                hist = self._histograms[stage] = Histogram()
+            hist.observe(seconds)
+
+    def stage(self, name):
+        """``with metrics.stage("validate"): ...`` — times the block when enabled."""
+        if not self.enabled:
+            return _DISABLED
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self.started = time.time()
+
+    # ---------------- Output ----------------
+
+    def summary(self):
+        """One dict per stage: count, mean / p50 / p95 / p99 / max in milliseconds."""
+        with self._lock:
+            items = sorted(self._histograms.items())
+            return [
+                {
+                    "Stage": stage,
+                    "Count": h.count,
+                    "Mean ms": round(1000 * h.sum / h.count, 2),
+                    "p50 ms": round(1000 * h.quantile(0.50), 2),
+                    "p95 ms": round(1000 * h.quantile(0.95), 2),
+                    "p99 ms": round(1000 * h.quantile(0.99), 2),
+                    "Max ms": round(1000 * h.max, 2),
+                    "Total s": round(h.sum, 3),
+                }
+                for stage, h in items
+            ]
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP karate_stage_seconds Time spent per app stage.",
+            "# TYPE karate_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for le, n in zip(h.buckets + ("+Inf",), h.counts):
+                    cumulative += n
+                    lines.append(f'karate_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'karate_stage_seconds_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'karate_stage_seconds_count{{stage="{stage}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def to_json(self):
+        return json.dumps({"since": self.started, "at": time.time(), "stages": self.summary()}, indent=2)
+
+    def maybe_export(self, force=False):
+        """Rewrite ``export_path`` (.json -> JSON, else Prometheus text) at most every EXPORT_INTERVAL."""
+        if not self.enabled or self.export_path is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_export < EXPORT_INTERVAL:
+            return
+        self._last_export = now
+        text = self.to_json() if self.export_path.suffix == ".json" else self.to_prometheus()
+        tmp_path = self.export_path.with_name(f"{self.export_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, self.export_path)
+        except OSError as e:
+            print("Metrics export error:", e)
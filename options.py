@@ -0,0 +1,168 @@
+import json
+import os
+from pathlib import Path
+
+# =====================================================
+# ---------------- Championship Schema -----------------
+# =====================================================
+#
+# كل البطولات وقوائمها وقواعد الاتحادات في championships.json (أو KARATE_SCHEMA=path).
+# الملف يُقرأ ويُحوّل مرة واحدة عند تحميل الـ module (مرة لكل عملية) إلى tuples وجداول بحث
+# يستخدمها النموذج والتحقق — إضافة بطولة جديدة = تعديل الملف فقط بدون تغيير الكود.
+#
+# كل بطولة في الملف:
+#   name           الاسم كما يظهر في القائمة
+#   courses        (اختياري) أنواع الكورس — البطولة تُحفظ باسم stored_as.format(course=...)
+#   shared_fields  حقول تُدخل مرة واحدة لكل اللاعبين (Club / Nationality / Coach Name / Phone Number)
+#   player_fields  حقول تُدخل لكل لاعب (بالإضافة للاسم وتاريخ الميلاد والجنس والحزام)
+#   federations    (اختياري) {مفتاح اتحاد: {competitions: مفتاح قائمة, weight_height: true}}
+#   competitions   (بدون اتحادات) مفتاح قائمة المسابقات — بدونها لا توجد مسابقات
+#   age_range      (اختياري) [أقل سن, أكبر سن] في يوم التحقق — حسب لائحة البطولة / الكورس
+# وكل قائمة في competition_lists يجب أن تستخدمها بطولة واحدة على الأقل.
+
+SCHEMA_FILE = Path(os.environ.get("KARATE_SCHEMA") or Path(__file__).with_name("championships.json"))
+
+SHARED_FIELDS = ("Club", "Nationality", "Coach Name", "Phone Number")
+
+
+class SchemaError(ValueError):
+    pass
+
+
+class Championship:
+    """One championship compiled from the schema: option tuples and per-federation lookups."""
+
+    def __init__(self, name, courses, stored_as, shared_fields, player_fields, competitions, weight_height,
+                 age_range=None):
+        self.name = name
+        self.courses = courses
+        self.stored_as = stored_as
+        self.shared_fields = shared_fields
+        self.player_fields = player_fields
+        self.competitions = competitions            # {اتحاد ("" = بدون): tuple المسابقات}
+        self.weight_height = weight_height          # الاتحادات التي تطلب الوزن والطول
+        self.age_range = age_range                  # (من, إلى) أو None = بدون حد خاص
+        self.federations = tuple(f for f in competitions if f)
+        self.has_competitions = any(competitions.values())
+        self.all_competitions = tuple(dict.fromkeys(c for comps in competitions.values() for c in comps))
+        self.stored_names = tuple(stored_as.format(course=c) for c in courses) if courses else (name,)
+        self.grid_columns = (
+            ["Athlete Name", "Date of Birth"] + list(player_fields) + ["Sex", "Belt Degree"]
+            + (["Federation"] if self.federations else [])
+            + (["Weight", "Height"] if weight_height else [])
+            + (["Competitions"] if self.has_competitions else [])
+        )
+
+    def stored_name(self, course=""):
+        return self.stored_as.format(course=course) if self.courses else self.name
+
+    def competitions_for(self, federation=""):
+        return self.competitions.get(federation if self.federations else "", ())
+
+
+def _check(values, known, what, where):
+    unknown = [v for v in values if v not in known]
+    if unknown:
+        raise SchemaError(f"{where}: unknown {what} {unknown}")
+    return tuple(values)
+
+
+def compile_schema(raw):
+    """Validate the raw JSON and return the compiled lookup tables as a dict."""
+    federations = dict(raw["federations"])
+    lists = {key: tuple(values) for key, values in raw["competition_lists"].items()}
+    sexes = tuple(raw["sexes"])
+
+    championships = {}
+    used_lists = set()
+    for c in raw["championships"]:
+        name = c["name"]
+        if name in championships:
+            raise SchemaError(f"Duplicate championship {name!r}")
+        courses = tuple(c.get("courses") or ())
+        stored_as = c.get("stored_as", "")
+        if courses and "{course}" not in stored_as:
+            raise SchemaError(f"{name}: 'stored_as' must contain {{course}}")
+
+        age_range = c.get("age_range")
+        if age_range is not None:
+            if len(age_range) != 2 or not all(isinstance(a, int) for a in age_range) or age_range[0] > age_range[1]:
+                raise SchemaError(f"{name}: 'age_range' must be [min, max] in whole years")
+            age_range = tuple(age_range)
+
+        rules = c.get("federations") or {}
+        _check(rules, federations, "federations", name)
+        list_keys = [r.get("competitions") for r in rules.values()] + [c.get("competitions")]
+        _check([k for k in list_keys if k], lists, "competition lists", name)
+
+        if rules:
+            competitions = {federations[f]: lists.get(r.get("competitions"), ()) for f, r in rules.items()}
+        else:
+            competitions = {"": lists.get(c.get("competitions"), ())}
+        used_lists.update(k for k in list_keys if k)
+        championships[name] = Championship(
+            name, courses, stored_as,
+            _check(c.get("shared_fields") or (), SHARED_FIELDS, "shared_fields", name),
+            _check(c.get("player_fields") or (), SHARED_FIELDS[1:], "player_fields", name),
+            competitions,
+            frozenset(federations[f] for f, r in rules.items() if r.get("weight_height")),
+            age_range,
+        )
+
+    unused = [k for k in lists if k not in used_lists]
+    if unused:
+        raise SchemaError(f"competition lists not used by any championship {unused}")
+
+    sex_only = dict(raw.get("sex_only_competitions") or {})
+    _check(sex_only.values(), sexes, "sexes", "sex_only_competitions")
+
+    return {
+        "championships": championships,
+        "sexes": sexes,
+        "belts": tuple(raw["belts"]),
+        "federations": tuple(federations.values()),
+        "sex_only": sex_only,
+    }
+
+
+def load_schema(path=SCHEMA_FILE):
+    try:
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise SchemaError(f"Cannot read championship schema {path}: {e}") from e
+    try:
+        return compile_schema(raw)
+    except (KeyError, TypeError, AttributeError) as e:
+        raise SchemaError(f"Malformed championship schema {path}: {e!r}") from e
+
+
+# =====================================================
+# ---------------- Compiled Options --------------------
+# =====================================================
+
+_SCHEMA = load_schema()
+
+CHAMPIONSHIP_SPECS = _SCHEMA["championships"]
+CHAMPIONSHIPS = tuple(CHAMPIONSHIP_SPECS)
+
+SEX_OPTIONS = _SCHEMA["sexes"]
+BELT_OPTIONS = _SCHEMA["belts"]
+FEDERATIONS = _SCHEMA["federations"]
+SEX_ONLY_COMPETITIONS = _SCHEMA["sex_only"]
+
+# اسم البطولة كما يُحفظ في الملف (مع نوع الكورس) -> تعريفها
+STORED_CHAMPIONSHIPS = {stored: spec for spec in CHAMPIONSHIP_SPECS.values() for stored in spec.stored_names}
+
+# (البطولة المحفوظة, الاتحاد) المسموح بها، و(البطولة, الاتحاد, المسابقة) المسموح بها
+VALID_FEDERATIONS = frozenset(
+    (stored, f) for stored, spec in STORED_CHAMPIONSHIPS.items() for f in spec.federations
+)
+VALID_COMPETITIONS = frozenset(
+    (stored, f, c)
+    for stored, spec in STORED_CHAMPIONSHIPS.items()
+    for f, comps in spec.competitions.items()
+    for c in comps
+)
+WEIGHT_HEIGHT = frozenset(
+    (stored, f) for stored, spec in STORED_CHAMPIONSHIPS.items() for f in spec.weight_height
+)
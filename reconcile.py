@@ -0,0 +1,157 @@
+import hashlib
+import sys
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+import requests
+
+from frames import as_text
+from sheet_sync import TIMEOUT, make_session
+
+# =====================================================
+# ---------------- Sheet Reconciliation ----------------
+# =====================================================
+#
+# مقارنة الملف المحلي بجوجل شيت بواسطة hash ثابت لمحتوى كل صف:
+#   - hash لكل صف محلي (يُحسب مرة واحدة ثم للصفوف الجديدة فقط)
+#   - hash لكل صف في الشيت (GET ?action=rows)
+#   - الصفوف الموجودة محلياً فقط (وليست في الـ outbox) تُضاف للـ outbox وتُرسل على دفعات
+# الصفوف الموجودة في الشيت فقط تُحسب كـ drift ولا تُحذف.
+#
+# الـ Apps Script يحتاج doGet يرجع الصفوف بنفس أسماء الأعمدة:
+#   function doGet(e) {
+#     var values = SpreadsheetApp.getActiveSheet().getDataRange().getDisplayValues();
+#     var header = values.shift();
+#     var rows = values.map(function (r) {
+#       var o = {}; header.forEach(function (h, i) { o[h] = r[i]; }); return o;
+#     });
+#     return ContentService.createTextOutput(JSON.stringify({rows: rows}))
+#       .setMimeType(ContentService.MimeType.JSON);
+#   }
+
+HASH_COLUMNS = (
+    "Championship", "Athlete Name", "Club", "Nationality", "Coach Name", "Phone Number",
+    "Date of Birth", "Sex", "Belt Degree", "Weight", "Height", "Competitions", "Federation"
+)
+STATE_KEY = "reconcile"
+FETCH_TIMEOUT = (TIMEOUT[0], 60)
+
+
+class ReconcileError(RuntimeError):
+    pass
+
+
+def _canonical(df, col):
+    """Text form that survives the round trip through the sheet (numbers, dates, leading zeros)."""
+    if col not in df.columns:
+        return pd.Series("", index=df.index)
+    text = as_text(df[col]).str.strip()
+    if col in ("Weight", "Height"):
+        number = pd.to_numeric(text, errors="coerce")
+        return number.map(lambda v: f"{v:g}", na_action="ignore").fillna("")
+    if col == "Date of Birth":
+        return text.str[:10]
+    if col == "Phone Number":
+        # الشيت يحذف الصفر في البداية إذا كان العمود رقمياً
+        return text.str.replace(r"\D", "", regex=True).str.lstrip("0")
+    return text.str.replace(r"\s+", " ", regex=True)
+
+
+def row_hashes(df):
+    """Stable 64-bit content hash (hex) per row, same result for local and sheet rows."""
+    if df is None or df.empty:
+        return []
+    joined = _canonical(df, HASH_COLUMNS[0])
+    for col in HASH_COLUMNS[1:]:
+        joined = joined + "\x1f" + _canonical(df, col)
+    return [hashlib.blake2b(v.encode("utf-8"), digest_size=8).hexdigest() for v in joined]
+
+
+class Reconciler:
+    """Diff local rows against the sheet by content hash and queue only what is missing."""
+
+    def __init__(self, store, outbox, url, session=None, timeout=FETCH_TIMEOUT):
+        self.store = store
+        self.outbox = outbox
+        self.url = url
+        self.session = session or make_session()
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.hashes = []        # hash لكل صف محلي بنفس الترتيب
+
+    def _sync_local(self, df):
+        if len(df) < len(self.hashes):
+            self.hashes = []
+        if len(df) > len(self.hashes):
+            self.hashes.extend(row_hashes(df.iloc[len(self.hashes):]))
+
+    def fetch_sheet_rows(self):
+        try:
+            response = self.session.get(self.url, params={"action": "rows"}, timeout=self.timeout)
+            response.raise_for_status()
+            rows = response.json()["rows"]
+        except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+            raise ReconcileError(f"Could not read the sheet: {e}") from e
+        if not isinstance(rows, list):
+            raise ReconcileError("Sheet response has no row list")
+        return rows
+
+    def run(self, push=True):
+        """One pass. Returns (and stores) the summary: watermark, missing, extra, pushed."""
+        with self.lock:
+            df = self.store.load()
+            self._sync_local(df)
+            sheet = Counter(row_hashes(pd.DataFrame(self.fetch_sheet_rows())))
+            queued = Counter(row_hashes(pd.DataFrame(self.outbox.pending())))
+
+            missing = []
+            for pos, h in enumerate(self.hashes):
+                if sheet[h]:
+                    sheet[h] -= 1
+                elif queued[h]:
+                    queued[h] -= 1      # في الطريق — لا نرسله مرة ثانية
+                else:
+                    missing.append(pos)
+            extra = sum(sheet.values())
+
+            if push and missing:
+                rows = df.iloc[missing]
+                self.outbox.enqueue(
+                    pd.DataFrame({c: as_text(rows[c]) for c in rows.columns}).to_dict("records")
+                )
+
+            summary = {
+                "at": time.time(),
+                "local_rows": len(df),
+                "watermark": missing[0] if missing else len(df),    # الصفوف قبل هذا الرقم موجودة في الشيت
+                "missing": len(missing),
+                "extra": extra,
+                "drift": len(missing) + extra,
+                "pushed": len(missing) if push else 0,
+            }
+            self.outbox.set_state(STATE_KEY, summary)
+            return summary
+
+    def last_run(self):
+        return self.outbox.get_state(STATE_KEY)
+
+
+# =====================================================
+# ---------------- CLI ---------------------------------
+# =====================================================
+#
+#   python reconcile.py athletes_data.csv https://script.google.com/.../exec [--dry-run]
+
+if __name__ == "__main__":
+    from sheet_sync import Outbox
+    from storage import COLUMNS, CsvStore
+
+    args = [a for a in sys.argv[1:] if a != "--dry-run"]
+    if len(args) != 2:
+        sys.exit("usage: python reconcile.py DATA_CSV SHEET_URL [--dry-run]")
+
+    summary = Reconciler(CsvStore(args[0], COLUMNS), Outbox(), args[1]).run(push="--dry-run" not in sys.argv)
+    print(f"{summary['local_rows']} local rows, verified up to row {summary['watermark']}: "
+          f"{summary['missing']} missing in sheet, {summary['extra']} only in sheet, {summary['pushed']} queued")
@@ -0,0 +1,35 @@
+from metrics import StageMetrics
+
+# =====================================================
+# ---------------- Save Registration -------------------
+# =====================================================
+#
+# مسار الحفظ الكامل لـ "Submit All": فحص التكرار ← الإضافة للملف ← outbox جوجل شيت ← عدد اللاعبين في كل فئة.
+# rr.py (save_data) و benchmarks/run.py يستدعيان نفس الدالة حتى لا يختلف ما يُقاس عما يعمل فعلاً.
+
+_NO_METRICS = StageMetrics()
+
+
+def save_athletes(new_players, store, identity, outbox, divisions, metrics=_NO_METRICS, wake=None):
+    """Save ``new_players`` unless one is a duplicate; returns {batch position: reason}, empty if saved."""
+    # الفحص والإضافة تحت نفس القفل حتى لا يمر نفس اللاعب من جلستين في نفس اللحظة
+    with identity.lock:
+        with metrics.stage("save_data:duplicate_check"):
+            identity.sync(store.load())
+            duplicates = identity.check(new_players)
+        if duplicates:
+            return duplicates
+
+        # إضافة اللاعبين الجدد فقط إلى الملف (بدون إعادة كتابة كل البيانات)
+        with metrics.stage("save_data:write"):
+            store.append(new_players)
+
+    # إرسال اللاعبين الجدد لجوجل شيت في الخلفية (wake يوقظ الـ worker إن وُجد)
+    with metrics.stage("save_data:enqueue"):
+        outbox.enqueue(new_players)
+        if wake is not None:
+            wake()
+
+    with metrics.stage("save_data:divisions"):
+        divisions.sync(store.load())
+    return {}
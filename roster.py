@@ -0,0 +1,78 @@
+import io
+from pathlib import Path
+
+import pandas as pd
+
+from options import STORED_CHAMPIONSHIPS
+from validation import REQUIRED_FIELDS
+
+# =====================================================
+# ---------------- Roster Import -----------------------
+# =====================================================
+#
+# رفع ملف CSV / Excel بنفس أعمدة BILINGUAL_COLS (بالعربي والإنجليزي أو الإنجليزي فقط)
+# ثم التحقق منه دفعة واحدة بدلاً من إدخال كل لاعب يدوياً.
+
+
+# تاريخ الميلاد: YYYY-MM-DD (أو datetime من Excel) أو DD/MM/YYYY (اليوم أولاً دائماً — بدون تخمين لكل خلية)؛
+# أي صيغة أخرى تبقى كما هي ويظهر خطأ التاريخ في validate_batch
+DATE_HINT = "YYYY-MM-DD or DD/MM/YYYY"
+_ISO_DATE = r"^(\d{4}-\d{2}-\d{2})(?: 00:00:00)?$"      # Excel datetime يُقرأ كـ "2010-03-05 00:00:00"
+_DAY_FIRST = r"\d{1,2}/\d{1,2}/\d{4}"
+
+# بعض الأسماء المحفوظة تنتهي بمسافة ("... ماستر ") — الاسم بعد strip يرجع للاسم المحفوظ
+_STORED_NAMES = {name.strip(): name for name in STORED_CHAMPIONSHIPS}
+
+
+class RosterError(ValueError):
+    pass
+
+
+def _template_header(eng, bi):
+    return f"{bi} ({DATE_HINT})" if eng == "Date of Birth" else bi
+
+
+def _dates_of_birth(dob):
+    iso = dob.str.extract(_ISO_DATE, expand=False)
+    day_first = pd.to_datetime(dob.where(dob.str.fullmatch(_DAY_FIRST)), format="%d/%m/%Y", errors="coerce")
+    return iso.fillna(day_first.dt.strftime("%Y-%m-%d")).fillna(dob)
+
+
+def read_roster(uploaded_file, bilingual_cols, championship):
+    """Parse an uploaded roster into a frame with the English column names."""
+    name = Path(getattr(uploaded_file, "name", "")).suffix.lower()
+    data = uploaded_file.getvalue() if hasattr(uploaded_file, "getvalue") else uploaded_file.read()
+
+    if name in (".xlsx", ".xls"):
+        df = pd.read_excel(io.BytesIO(data), dtype=str).fillna("")
+    else:
+        df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False, encoding="utf-8-sig")
+
+    # الأعمدة يمكن أن تكون "Club / النادي" أو "Club"
+    header_map = {bi.strip(): eng for eng, bi in bilingual_cols.items()}
+    header_map.update({eng: eng for eng in bilingual_cols})
+    header_map.update({_template_header(eng, bi): eng for eng, bi in bilingual_cols.items()})
+    df.columns = [header_map.get(str(c).strip(), str(c).strip()) for c in df.columns]
+
+    missing = [c for c in REQUIRED_FIELDS if c not in df.columns]
+    if missing:
+        raise RosterError("Missing columns / أعمدة ناقصة: " + ", ".join(bilingual_cols[c] for c in missing))
+
+    df = df.reindex(columns=list(bilingual_cols.keys()), fill_value="")
+    df = df.apply(lambda s: s.astype(str).str.strip())
+
+    # حذف الصفوف الفارغة بالكامل
+    df = df[df.ne("").any(axis=1)].reset_index(drop=True)
+
+    # Excel يحذف الصفر الأول من الأرقام ويحوّل التواريخ إلى datetime
+    df["Phone Number"] = df["Phone Number"].str.replace(r"^1(\d{9})(\.0)?$", r"01\1", regex=True)
+    df["Date of Birth"] = _dates_of_birth(df["Date of Birth"])
+
+    df["Championship"] = df["Championship"].map(_STORED_NAMES).fillna(df["Championship"])
+    df["Championship"] = df["Championship"].mask(df["Championship"] == "", championship)
+    return df
+
+
+def roster_template(bilingual_cols):
+    columns = [_template_header(eng, bi) for eng, bi in bilingual_cols.items()]
+    return pd.DataFrame(columns=columns).to_csv(index=False).encode("utf-8-sig")
@@ -1,60 +1,141 @@
 import streamlit as st
 import pandas as pd
-from datetime import date
-import io
+from datetime import date, datetime
+import os
+import time
 from pathlib import Path
-import requests
-import re  
+
+from assets import logo_src
+from memory import MemoryProfiler, deep_size, rss_bytes
+from metrics import StageMetrics
+from storage import CsvStore, SqliteStore
+from sessions import IDLE_SECONDS, MAX_PLAYERS, SWEEP_INTERVAL, Draft, SessionRegistry
+from sheet_sync import Outbox, SheetSyncWorker
+from reconcile import ReconcileError, Reconciler
+from roster import RosterError, read_roster, roster_template
+from admin_query import FILTER_COLS
+from duplicates import IdentityIndex, duplicates_frame
+from registration import save_athletes
+from divisions import DivisionIndex, draw_sheet
+from validation import validate_batch
+from export import CSV_MIME, EXCEL_MIME, to_csv_bytes, to_excel_bytes
+from options import BELT_OPTIONS, CHAMPIONSHIP_SPECS, CHAMPIONSHIPS, SEX_OPTIONS
 
 # =====================================================
 # ---------------- Google Sheet API -------------------
 # =====================================================
 
-GOOGLE_SHEET_API = "https://script.google.com/macros/s/AKfycbwpQE31wpWDOj0D9Rgy1pRTI_9qTwDi1qUt4Zv4eylv8US3jFnt1bkWXun1UxL5naS9/exec"
+GOOGLE_SHEET_API = os.environ.get(
+    "GOOGLE_SHEET_API",
+    "https://script.google.com/macros/s/AKfycbwpQE31wpWDOj0D9Rgy1pRTI_9qTwDi1qUt4Zv4eylv8US3jFnt1bkWXun1UxL5naS9/exec"
+)
 
-# ---------------- Google Sheet Sender -----------------
-def save_to_google_sheet(player):
-    try:
-        response = requests.post(GOOGLE_SHEET_API, json=player)
-        return response.status_code == 200
-    except Exception as e:
-        print("Google Sheet Error:", e)
-        return False
+# =====================================================
+# ---------------- Performance Metrics -----------------
+# =====================================================
+#
+# KARATE_METRICS=1 لتفعيل قياس زمن كل مرحلة (يظهر في لوحة الأدمن)
+# KARATE_METRICS_FILE=metrics.prom (أو .json) لكتابة المقاييس في ملف كل 10 ثواني
 
-def save_data(df, new_players):
-    # حفظ كل البيانات في CSV
-    df.to_csv(DATA_FILE, index=False)
+RERUN_STARTED = time.perf_counter()
 
-    # إرسال فقط اللاعبين الجدد لجوجل شيت
-    for player in new_players:
-        save_to_google_sheet(player)
+METRICS_ENABLED = os.environ.get("KARATE_METRICS", "0") == "1"
+METRICS_FILE = os.environ.get("KARATE_METRICS_FILE")
 
+@st.cache_resource
+def get_metrics():
+    return StageMetrics(enabled=METRICS_ENABLED, export_path=METRICS_FILE)
 
-def validate_phone(phone):
-    pattern = r'^01[0-9]{9}$'
-    if re.match(pattern, phone.strip()):
-        return True
-    return False
+metrics = get_metrics()
+
+def finish_rerun():
+    # يُستدعى قبل st.stop() وفي نهاية السكريبت
+    metrics.observe(f"rerun:{st.session_state.page}", time.perf_counter() - RERUN_STARTED)
+    metrics.maybe_export()
+
+# =====================================================
+# ---------------- Sessions / Memory -------------------
+# =====================================================
+#
+# KARATE_MAX_PLAYERS: أقصى عدد لاعبين في الإرسال الواحد (النموذج والجدول)
+# KARATE_SESSION_IDLE: بعد كم ثانية بدون نشاط تُمسح مسودة الجلسة
+# KARATE_TRACEMALLOC=1: تفعيل tracemalloc snapshots في لوحة الأدمن
+
+MAX_PLAYERS = int(os.environ.get("KARATE_MAX_PLAYERS", MAX_PLAYERS))
+SESSION_IDLE_SECONDS = float(os.environ.get("KARATE_SESSION_IDLE", IDLE_SECONDS))
+TRACEMALLOC_ENABLED = os.environ.get("KARATE_TRACEMALLOC", "0") == "1"
+
+@st.cache_resource
+def get_sessions():
+    # كل مسودات الجلسات في العملية (weakref) — لمسح الخاملة وتقرير الذاكرة
+    return SessionRegistry(SESSION_IDLE_SECONDS)
+
+@st.cache_resource
+def get_memory_profiler():
+    return MemoryProfiler(enabled=TRACEMALLOC_ENABLED)
+
+# ---------------- Google Sheet Sender -----------------
+@st.cache_resource
+def get_sheet_sync():
+    # worker واحد في الخلفية لكل عملية
+    worker = SheetSyncWorker(Outbox(), GOOGLE_SHEET_API, metrics=get_metrics())
+    worker.start()
+    return worker
+
+@st.cache_resource
+def get_reconciler():
+    # مقارنة الملف بالشيت بالـ hash — الصفوف الناقصة فقط تُضاف للـ outbox
+    return Reconciler(get_store(), get_sheet_sync().outbox, GOOGLE_SHEET_API)
+
+@st.cache_resource
+def get_store():
+    # نسخة واحدة لكل العمليات/الجلسات حتى يعمل القفل والـ compaction بشكل صحيح
+    if STORAGE_BACKEND == "sqlite":
+        # أول تشغيل: نقل البيانات الموجودة من CSV تلقائياً
+        return SqliteStore(DB_FILE, BILINGUAL_COLS.keys(), migrate_from=DATA_FILE)
+    return CsvStore(DATA_FILE, BILINGUAL_COLS.keys())
+
+@st.cache_resource
+def get_identity_index():
+    # فهرس واحد (اسم + تاريخ ميلاد + بطولة) مشترك بين كل الجلسات
+    return IdentityIndex()
+
+@st.cache_resource(max_entries=1)
+def get_division_index(on):
+    # عدد اللاعبين في كل فئة — يُحدّث بالصفوف الجديدة فقط
+    # المفتاح هو يوم حساب السن: بدون KARATE_EVENT_DATE يتغير كل يوم فيُبنى الفهرس من جديد
+    return DivisionIndex(on)
+
+def event_date():
+    # نفس اليوم لفهرس الفئات وجداول القرعة
+    return date.fromisoformat(EVENT_DATE) if EVENT_DATE else date.today()
+
+def save_data(new_players):
+    """يحفظ اللاعبين الجدد ويرجع {رقم اللاعب: السبب} للمكررين — لا يُحفظ شيء إذا وُجد تكرار"""
+    sync = get_sheet_sync()
+    return save_athletes(
+        new_players, get_store(), get_identity_index(), sync.outbox, get_division_index(event_date()),
+        metrics, wake=sync.wake
+    )
 
-def validate_weight_height(weight, height):
-    """التحقق من صحة الوزن والطول"""
-    try:
-        w = float(weight)
-        h = float(height)
-        if 30 <= w <= 200 and 140 <= h <= 250:
-            return True
-        return False
-    except:
-        return False
 
 # =====================================================
 # ---------------- Logos ------------------------------
 # =====================================================
 
-img1 = "https://raw.githubusercontent.com/alaabahaaahmed21-dotcom/karate-registration/main/logo1.png"
-img2 = "https://raw.githubusercontent.com/alaabahaaahmed21-dotcom/karate-registration/main/logo2.png"
-img3 = "https://raw.githubusercontent.com/alaabahaaahmed21-dotcom/karate-registration/main/logo3.png"
-img4 = "https://raw.githubusercontent.com/alaabahaaahmed21-dotcom/karate-registration/main/logo4.png"
+LOGO_DIR = Path(__file__).parent
+LOGO_URL = "https://raw.githubusercontent.com/alaabahaaahmed21-dotcom/karate-registration/main/{}"
+
+@st.cache_resource
+def get_logos():
+    # تُبنى مرة واحدة لكل عملية — GitHub فقط إذا لم يوجد الملف محلياً
+    static_dir = LOGO_DIR / "static" if st.get_option("server.enableStaticServing") else None
+    return [
+        logo_src(LOGO_DIR / f"logo{i}.png", LOGO_URL.format(f"logo{i}.png"), static_dir)
+        for i in range(1, 5)
+    ]
+
+img1, img2, img3, img4 = get_logos()
 
 # =====================================================
 # ---------------- CSS --------------------------------
@@ -75,6 +156,9 @@ if "page" not in st.session_state:
     st.session_state.page = "select_championship"
 
 DATA_FILE = Path("athletes_data.csv")
+DB_FILE = Path("athletes_data.sqlite3")
+STORAGE_BACKEND = os.environ.get("KARATE_STORAGE", "csv")    # csv | sqlite
+EVENT_DATE = os.environ.get("KARATE_EVENT_DATE")             # YYYY-MM-DD — السن للفئات يُحسب في يوم البطولة (الافتراضي: اليوم)
 
 # =====================================================
 # ---------------- Bilingual headers -------------------
@@ -119,60 +203,148 @@ BILINGUAL_LABELS = {
     "Enter Phone Number for the Coach": "Enter Phone Number for the Coach / أدخل رقم هاتف المدرب",
     "Number of players to add:": "Number of players to add: / عدد اللاعبين المراد إضافتهم",
     "Choose course type:": "Choose course type: / اختر نوع الدورة",
-    "Select Federation": "Select Federation / اختر الاتحاد"
+    "Select Federation": "Select Federation / اختر الاتحاد",
+    "Registration mode": "Registration mode / طريقة التسجيل",
+    "Upload roster": "Upload roster (CSV / Excel) — Date of Birth: YYYY-MM-DD or DD/MM/YYYY / رفع ملف اللاعبين — تاريخ الميلاد: سنة-شهر-يوم أو يوم/شهر/سنة"
 }
 
+# الحقول المشتركة: العنوان — والحقول لكل لاعب: بادئة مفتاح الـ widget (sessions.PLAYER_WIDGETS)
+SHARED_INPUTS = {
+    "Club": "Enter Club for all players",
+    "Nationality": "Enter Nationality for all players",
+    "Coach Name": "Enter Coach Name for all players",
+    "Phone Number": "Enter Phone Number for the Coach",
+}
+PLAYER_INPUTS = {"Nationality": "nat", "Coach Name": "pcoach", "Phone Number": "phone"}
+
 # =====================================================
-# ---------------- Load Data ---------------------------
+# ---------------- Table (Grid) Mode -------------------
 # =====================================================
-def load_data():
-    cols = list(BILINGUAL_COLS.keys())
 
-    if DATA_FILE.exists():
-        try:
-            df = pd.read_csv(
-                DATA_FILE,
-                encoding="utf-8",
-                encoding_errors="replace",
-                on_bad_lines="skip"     # تخطي أي سطر تالف
-            )
-        except Exception:
-            df = pd.read_csv(
-                DATA_FILE,
-                encoding="latin-1",
-                encoding_errors="replace",
-                on_bad_lines="skip"
-            )
+# الأعمدة والقوائم لكل بطولة من championships.json (spec.grid_columns / spec.federations / spec.all_competitions)
 
-        # تأكيد وجود جميع الأعمدة
-        for c in cols:
-            if c not in df.columns:
-                df[c] = ""
+def grid_column_config(spec):
+    competitions = BILINGUAL_LABELS["Competitions"]
+    if hasattr(st.column_config, "MultiselectColumn"):
+        competitions_col = st.column_config.MultiselectColumn(competitions, options=spec.all_competitions)
+    else:
+        # إصدارات streamlit القديمة: المسابقات مفصولة بفاصلة
+        competitions_col = st.column_config.TextColumn(competitions, help="Comma separated / مفصولة بفاصلة")
+
+    config = {
+        "Athlete Name": st.column_config.TextColumn(BILINGUAL_LABELS["Athlete Name"], required=True),
+        "Date of Birth": st.column_config.DateColumn(
+            BILINGUAL_LABELS["Date of Birth"], min_value=date(1960,1,1), max_value=date.today(), format="YYYY-MM-DD"
+        ),
+        "Nationality": st.column_config.TextColumn(BILINGUAL_LABELS["Nationality"]),
+        "Phone Number": st.column_config.TextColumn(BILINGUAL_LABELS["Phone Number"]),
+        "Sex": st.column_config.SelectboxColumn(
+            BILINGUAL_LABELS["Sex"], options=SEX_OPTIONS, default=SEX_OPTIONS[0], required=True
+        ),
+        "Belt Degree": st.column_config.SelectboxColumn(
+            BILINGUAL_LABELS["Belt Degree"], options=BELT_OPTIONS, default=BELT_OPTIONS[0], required=True
+        ),
+        "Federation": st.column_config.SelectboxColumn(
+            BILINGUAL_LABELS["Federation"], options=spec.federations,
+            default=spec.federations[0] if spec.federations else None, required=True
+        ),
+        "Weight": st.column_config.NumberColumn(
+            BILINGUAL_LABELS["Weight"], min_value=30.0, max_value=200.0, format="%.1f",
+            help="United General Committee only / لجنة الجنرال فقط"
+        ),
+        "Height": st.column_config.NumberColumn(
+            BILINGUAL_LABELS["Height"], min_value=140, max_value=250, step=1, format="%d",
+            help="United General Committee only / لجنة الجنرال فقط"
+        ),
+        "Competitions": competitions_col,
+    }
+    return {c: config[c] for c in spec.grid_columns}
+
+def _grid_value(value):
+    # None / NaN / NaT / pd.NA = خلية فارغة (القوائم من MultiselectColumn ليست scalar)
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return ""
+    return value
+
+def _grid_date(value):
+    # نفس شكل النموذج "YYYY-MM-DD" — الـ data_editor يرجع date أو Timestamp أو نص
+    if value == "":
+        return ""
+    try:
+        return pd.Timestamp(value).date().isoformat()
+    except (ValueError, TypeError):
+        return str(value)    # يظهر كخطأ تاريخ في validate_batch
+
+def grid_athletes(grid, shared, spec):
+    """Convert the edited table into athlete dicts (same shape as the expander form)."""
+    athletes = []
+    for row in grid.to_dict("records"):
+        row = {c: _grid_value(v) for c, v in row.items()}
+        if not any(row.get(c) not in ("", [], None) for c in ("Athlete Name", "Date of Birth", "Nationality", "Phone Number", "Competitions")):
+            continue    # صف فارغ
+
+        federation = row.get("Federation", "")
+        enable_weight_height = federation in spec.weight_height
+        competitions = row.get("Competitions", "")
+        if not isinstance(competitions, str):
+            competitions = ", ".join(competitions)
+
+        athlete = {
+            "Athlete Name": str(row.get("Athlete Name", "")).strip(),
+            "Nationality": str(row.get("Nationality", "")).strip(),
+            "Phone Number": str(row.get("Phone Number", "")).strip(),
+            "Date of Birth": _grid_date(row.get("Date of Birth", "")),
+            "Sex": row.get("Sex") or SEX_OPTIONS[0],
+            "Belt Degree": row.get("Belt Degree") or BELT_OPTIONS[0],
+            "Weight": str(float(row["Weight"])) if enable_weight_height and row.get("Weight") != "" else "",
+            "Height": str(int(row["Height"])) if enable_weight_height and row.get("Height") != "" else "",
+            "Competitions": competitions,
+            "Federation": federation,
+        }
+        athlete.update(shared)
+        athletes.append({c: athlete.get(c, "") for c in BILINGUAL_COLS})
+    return athletes
 
-        display_df = df.copy()
-        display_df.rename(columns=BILINGUAL_COLS, inplace=True)
-        return df, display_df
+def player_entered(athlete, spec):
+    """True if the coach typed something for this player (not only the widget defaults)."""
+    return any(athlete[c] for c in ("Athlete Name", "Competitions", *spec.player_fields))
 
-    return (
-        pd.DataFrame(columns=cols),
-        pd.DataFrame(columns=list(BILINGUAL_COLS.values()))
-    )
+# =====================================================
+# ---------------- Load Data ---------------------------
+# =====================================================
+def load_data():
+    # الإطارات مشتركة بين كل الجلسات (cache) — لا تعدل عليها مباشرة
+    with metrics.stage("load_data"):
+        return get_store().load()
+
+@st.cache_resource(max_entries=4)
+def export_file(_df, data_version, kind, split_by, on):
+    # ملف واحد لكل نسخة بيانات وصيغة — التحميل المتكرر لا يعيد البناء
+    # المفتاح هو store.version() (وليس id(df): الـ id يُعاد استخدامه بعد حذف الإطار القديم)
+    with metrics.stage(f"export:{kind}"):
+        if kind == "csv":
+            return to_csv_bytes(_df)
+        if kind == "draw":
+            return to_excel_bytes(draw_sheet(_df, on), split_by)
+        return to_excel_bytes(_df, split_by)
 
 # =====================================================
 # ---------------- Initialize Session State ------------
 # =====================================================
 
-if "submit_count" not in st.session_state:
-    st.session_state.submit_count = 0
+# مسودة واحدة لكل جلسة: البيانات المشتركة + عدد اللاعبين + رقم الدفعة (مفاتيح الـ widgets)
+if "draft" not in st.session_state:
+    st.session_state.draft = Draft()
+draft = st.session_state.draft
+draft_expired = get_sessions().touch(draft)
+
+@st.fragment(run_every=SWEEP_INTERVAL)
+def expire_idle_draft():
+    # يعمل أيضاً في التاب المتروك مفتوحاً؛ الـ rerun الكامل يحذف قيم الـ widgets القديمة من الجلسة
+    if get_sessions().expire(st.session_state.draft):
+        st.rerun(scope="app")
 
-if "club" not in st.session_state:
-    st.session_state.club = ""
-if "nationality" not in st.session_state:
-    st.session_state.nationality = ""
-if "coach_name" not in st.session_state:
-    st.session_state.coach_name = ""
-if "phone_number" not in st.session_state:
-    st.session_state.phone_number = ""
+expire_idle_draft()
 
 # =====================================================
 # ================= PAGE 1 =============================
@@ -193,11 +365,7 @@ if st.session_state.page == "select_championship":
 
     championship = st.selectbox(
         "Please select the championship / يرجى اختيار البطولة:",
-        [
-            "African Master Course / الماستر كورس الافريقى",
-            "African Open Traditional Karate Championship / بطولة افريقيا المفتوحة للكاراتيه التقليدي",
-            "North Africa United Karate Championship / بطولة شمال افريقيا للكارتيه الموحد"
-        ]
+        CHAMPIONSHIPS
     )
 
     if st.button("Next/التالي ➜"):
@@ -205,6 +373,7 @@ if st.session_state.page == "select_championship":
         st.session_state.page = "registration"
         st.rerun()
 
+    finish_rerun()
     st.stop()
 
 # =====================================================
@@ -231,188 +400,157 @@ if st.session_state.page == "registration":
         unsafe_allow_html=True
     )
 
-    athletes_data = []
+    registration_mode = st.radio(
+        BILINGUAL_LABELS["Registration mode"],
+        ["Form / نموذج", "Table / جدول", "Upload roster / رفع ملف"],
+        horizontal=True
+    )
 
-    submit_count = st.session_state.submit_count
-
-    if st.session_state.selected_championship.startswith("African Master Course"):
-
-        course_type = st.selectbox(BILINGUAL_LABELS["Choose course type:"], ["Master / ماستر ", "General / جنرال"])
-        st.session_state.club = st.text_input(BILINGUAL_LABELS["Enter Club for all players"], value=st.session_state.club)
-        num_players = st.number_input(BILINGUAL_LABELS["Number of players to add:"], min_value=1, value=1)
-
-        belt_options = [
-            "Kyu Junior yellow 10 / أصفر 10 كيو ناشئين", "Kyu Junior yellow 9 / أصفر 9 كيو ناشئين",
-            "Kyu Junior orange 8 / برتقالي 8 كيو ناشئين", "Kyu Junior orange green 7 / برتقالي أخضر 7 كيو ناشئين",
-            "Kyu Junior green 6 / أخضر 6 كيو ناشئين", "Kyu Junior green blue 5 / أخضر أزرق 5 كيو ناشئين",
-            "Kyu Junior blue 4 / أزرق 4 كيو ناشئين", "Kyu Junior blue 3 / أزرق 3 كيو ناشئين",
-            "Kyu Junior brown 2 / بني 2 كيو ناشئين", "Kyu Junior brown 1 / بني 1 كيو ناشئين",
-            "Kyu Senior yellow 7 / أصفر 7 كيو كبار", "Kyu Senior yellow 6 / أصفر 6 كيو كبار",
-            "Kyu Senior orange 5 / برتقالي 5 كيو كبار", "Kyu Senior orange 4 / برتقالي 4 كيو كبار",
-            "Kyu Senior green 3 / أخضر 3 كيو كبار", "Kyu Senior blue 2 / أزرق 2 كيو كبار",
-            "Kyu Senior brown 1 / بني 1 كيو كبار",
-            "Dan 1 / دان 1", "Dan 2 / دان 2", "Dan 3 / دان 3", "Dan 4 / دان 4",
-            "Dan 5 / دان 5", "Dan 6 / دان 6", "Dan 7 / دان 7", "Dan 8 / دان 8"
-        ]
-
-        for i in range(num_players):
-            suffix = f"_{submit_count}_{i}"
-            with st.expander(f"Player {i+1}"):
-                athlete_name = st.text_input(BILINGUAL_LABELS["Athlete Name"], key=f"name{suffix}")
-                dob = st.date_input(BILINGUAL_LABELS["Date of Birth"], min_value=date(1960,1,1), max_value=date.today(), key=f"dob{suffix}")
-                nationality = st.text_input(BILINGUAL_LABELS["Nationality"], key=f"nat{suffix}")
-                phone = st.text_input(BILINGUAL_LABELS["Phone Number"], key=f"phone{suffix}")
-                sex = st.selectbox(BILINGUAL_LABELS["Sex"], ["Male / ذكر", "Female / انثى"], key=f"sex{suffix}")
-                belt = st.selectbox(BILINGUAL_LABELS["Belt Degree"], belt_options, key=f"belt{suffix}")
-
-                federation = st.selectbox(
-                    BILINGUAL_LABELS["Select Federation"],
-                    ["Egyptian Traditional Karate Federation / الاتحاد المصري للكاراتيه التقليدي", 
-                     "United General Committee / لجنة الجنرال الموحد"],
-                    key=f"fed_master_{suffix}"
-                )
+    # الحقول والقوائم من championships.json — لا يوجد شرط خاص بأي بطولة في الكود
+    spec = CHAMPIONSHIP_SPECS.get(st.session_state.selected_championship)
+    if spec is None:
+        # البطولة لم تعد موجودة في الملف — الرجوع لاختيار البطولة
+        st.session_state.page = "select_championship"
+        st.rerun()
 
-                athletes_data.append({
-                    "Athlete Name": athlete_name.strip(),
-                    "Club": st.session_state.club.strip(),
-                    "Nationality": nationality.strip(),
-                    "Coach Name": "",
-                    "Phone Number": phone.strip(),
-                    "Date of Birth": str(dob),
-                    "Sex": sex,
-                    "Belt Degree": belt,
-                    "Weight": "",
-                    "Height": "",
-                    "Competitions": "",
-                    "Federation": federation,
-                    "Championship": f"African Master Course - {course_type}"
-                })
+    athletes_data = []
+    submitted = False
+    entered = False
+
+    submit_count = draft.submit_count
+    if draft_expired:
+        st.info(f"⏳ Unsaved players were cleared after {SESSION_IDLE_SECONDS / 60:g} minutes of inactivity / تم مسح البيانات غير المحفوظة بعد فترة عدم نشاط")
+
+    # ---------------- Bulk Roster Import ----------------
+    if registration_mode.startswith("Upload"):
+        course_type = st.selectbox(BILINGUAL_LABELS["Choose course type:"], spec.courses) if spec.courses else ""
+        championship = spec.stored_name(course_type)
+
+        st.download_button(
+            "📄 Download template / تحميل النموذج", roster_template(BILINGUAL_COLS),
+            file_name="roster_template.csv", mime="text/csv"
+        )
+        uploaded = st.file_uploader(
+            BILINGUAL_LABELS["Upload roster"], type=["csv", "xlsx"],
+            key=f"roster_{submit_count}"
+        )
+
+        roster_df = None
+        if uploaded is not None:
+            try:
+                with metrics.stage("roster_read"):
+                    roster_df = read_roster(uploaded, BILINGUAL_COLS, championship)
+            except (RosterError, ValueError) as e:
+                st.error(f"🔴 {e}")
+
+        if roster_df is not None:
+            st.write(f"**{len(roster_df)}** players found / لاعب")
+            st.dataframe(roster_df.rename(columns=BILINGUAL_COLS), use_container_width=True, hide_index=True)
+
+            with metrics.stage("validate"):
+                roster_errors = validate_batch(roster_df)
+            if not roster_errors.empty:
+                st.error("🔴 Fix the following errors:")
+                st.dataframe(roster_errors, use_container_width=True, hide_index=True)
+            elif st.button("📥 Import All / استيراد الكل") and not roster_df.empty:
+                # كتابة واحدة + دفعة واحدة لجوجل شيت
+                duplicates = save_data(roster_df.to_dict("records"))
+                if duplicates:
+                    st.error("🔴 Duplicate registrations — nothing was saved:")
+                    st.dataframe(pd.DataFrame({
+                        "Row": [i + 1 for i in duplicates],
+                        "Athlete Name": [roster_df.at[i, "Athlete Name"] for i in duplicates],
+                        "Error": list(duplicates.values())
+                    }), use_container_width=True, hide_index=True)
+                else:
+                    st.success(f"✅ {len(roster_df)} players registered successfully! ✓")
+                    draft.submit_count += 1
 
     else:
-        st.session_state.club = st.text_input(BILINGUAL_LABELS["Enter Club for all players"], value=st.session_state.club)
-        st.session_state.nationality = st.text_input(BILINGUAL_LABELS["Enter Nationality for all players"], value=st.session_state.nationality)
-        st.session_state.coach_name = st.text_input(BILINGUAL_LABELS["Enter Coach Name for all players"], value=st.session_state.coach_name)
-        st.session_state.phone_number = st.text_input(BILINGUAL_LABELS["Enter Phone Number for the Coach"], value=st.session_state.phone_number)
-        num_players = st.number_input(BILINGUAL_LABELS["Number of players to add:"], min_value=1, value=1)
-
-        belt_options = [
-            "Kyu Junior yellow 10 / أصفر 10 كيو ناشئين", "Kyu Junior yellow 9 / أصفر 9 كيو ناشئين",
-            "Kyu Junior orange 8 / برتقالي 8 كيو ناشئين", "Kyu Junior orange green 7 / برتقالي أخضر 7 كيو ناشئين",
-            "Kyu Junior green 6 / أخضر 6 كيو ناشئين", "Kyu Junior green blue 5 / أخضر أزرق 5 كيو ناشئين",
-            "Kyu Junior blue 4 / أزرق 4 كيو ناشئين", "Kyu Junior blue 3 / أزرق 3 كيو ناشئين",
-            "Kyu Junior brown 2 / بني 2 كيو ناشئين", "Kyu Junior brown 1 / بني 1 كيو ناشئين",
-            "Kyu Senior yellow 7 / أصفر 7 كيو كبار", "Kyu Senior yellow 6 / أصفر 6 كيو كبار",
-            "Kyu Senior orange 5 / برتقالي 5 كيو كبار", "Kyu Senior orange 4 / برتقالي 4 كيو كبار",
-            "Kyu Senior green 3 / أخضر 3 كيو كبار", "Kyu Senior blue 2 / أزرق 2 كيو كبار",
-            "Kyu Senior brown 1 / بني 1 كيو كبار",
-            "Dan 1 / دان 1", "Dan 2 / دان 2", "Dan 3 / دان 3", "Dan 4 / دان 4",
-            "Dan 5 / دان 5", "Dan 6 / دان 6", "Dan 7 / دان 7", "Dan 8 / دان 8"
-        ]
-
-        egyptian_competitions = [
-            "Individual Kata / كاتا فردي", "Kata Team / كاتا جماعي", "Individual Kumite / كوميتيه فردي",
-            "Fuko Go / فوكو جو", "Inbo Mix / إنبو مختلط", "Inbo Male / إنبو ذكور", "Inbo Female / إنبو إناث",
-            "Kumite Team /كوميتيه جماعي", "Ippon Shobu / ايبون شوبو"
-        ]
-
-        united_general_competitions = [
-            "Individual Kata / كاتا فردي", "Kata Team / كاتا جماعي",
-            "Kumite Ibon / كوميتيه إيبون", "Kumite Nihon / كوميتيه نيهون",
-            "Kumite Sanbon / كوميتيه سانبون", "Kumite Rote Shine / كوميتيه روت شاين"
-        ]
-
-        for i in range(num_players):
-            suffix = f"_{submit_count}_{i}"
-            with st.expander(f"Player {i+1}"):
-                athlete_name = st.text_input(BILINGUAL_LABELS["Athlete Name"], key=f"name{suffix}")
-                dob = st.date_input(BILINGUAL_LABELS["Date of Birth"], min_value=date(1960,1,1), max_value=date.today(), key=f"dob{suffix}")
-                sex = st.selectbox(BILINGUAL_LABELS["Sex"], ["Male / ذكر", "Female / انثى"], key=f"sex{suffix}")
-                belt = st.selectbox(BILINGUAL_LABELS["Belt Degree"], belt_options, key=f"belt{suffix}")
-                
-                # ✅ متغير لتفعيل الوزن والطول فقط عند اختيار اتحاد الجنرال
-                federation = ""
-                enable_weight_height = False
-                
-                federation_champs = [
-                    "African Open Traditional Karate Championship / بطولة افريقيا المفتوحة للكاراتيه التقليدي",
-                    "North Africa United Karate Championship / بطولة شمال افريقيا للكارتيه الموحد"
-                ]
-
-                if st.session_state.selected_championship in federation_champs:
-                    federation = st.selectbox(
-                        BILINGUAL_LABELS["Select Federation"],
-                        ["Egyptian Traditional Karate Federation / الاتحاد المصري للكاراتيه التقليدي", 
-                         "United General Committee / لجنة الجنرال الموحد"],
-                        key=f"fed{suffix}"
-                    )
-                    # ✅ تفعيل الوزن والطول فقط لـ "United General Committee"
-                    enable_weight_height = "United General Committee / لجنة الجنرال الموحد" in federation
-                else:
-                    comp_list = ["Individual Kata / كاتا فردي","Kata Team / كاتا جماعي","Individual Kumite / كوميتيه فردي",
-                                "Fuko Go / فوكو جو","Inbo Mix / إنبو مختلط","Inbo Male / إنبو ذكور",
-                                "Inbo Female / إنبو إناث","Kumite Team / كوميتيه جماعي", "Ippon Shobu / ايبون شوبو "]
-
-                # ✅ عرض الوزن والطول فقط عند اتحاد الجنرال
-                weight = ""
-                height = ""
-                if enable_weight_height:
-                    weight = st.number_input(BILINGUAL_LABELS["Weight"], min_value=30.0, max_value=200.0, format="%.1f", key=f"weight{suffix}")
-                    height = st.number_input(BILINGUAL_LABELS["Height"], min_value=140, max_value=250, format="%d", key=f"height{suffix}")
-                
-                if "comp_list" not in locals():
-                    comp_list = []
-                if st.session_state.selected_championship in federation_champs:
-                    comp_list = egyptian_competitions if "Egyptian" in federation else united_general_competitions
-
-                competitions = st.multiselect(BILINGUAL_LABELS["Competitions"], comp_list, key=f"comp{suffix}")
-
-                athletes_data.append({
-                    "Athlete Name": athlete_name.strip(),
-                    "Club": st.session_state.club.strip(),
-                    "Nationality": st.session_state.nationality.strip(),
-                    "Coach Name": st.session_state.coach_name.strip(),
-                    "Phone Number": st.session_state.phone_number.strip(),
-                    "Date of Birth": str(dob),
-                    "Sex": sex,
-                    "Belt Degree": belt,
-                    "Weight": str(weight) if enable_weight_height else "",
-                    "Height": str(height) if enable_weight_height else "",
-                    "Competitions": ", ".join(competitions),
-                    "Federation": federation,
-                    "Championship": st.session_state.selected_championship
-                })
+        course_type = st.selectbox(BILINGUAL_LABELS["Choose course type:"], spec.courses) if spec.courses else ""
+
+        shared = {"Championship": spec.stored_name(course_type)}
+        for field in spec.shared_fields:
+            draft.shared[field] = st.text_input(
+                BILINGUAL_LABELS[SHARED_INPUTS[field]], value=draft.shared.get(field, ""), key=draft.key("shared", field)
+            )
+            shared[field] = draft.shared[field].strip()
+
+        if registration_mode.startswith("Table"):
+            with st.form(f"grid_form_{submit_count}"):
+                grid = st.data_editor(
+                    pd.DataFrame(columns=spec.grid_columns),
+                    column_config=grid_column_config(spec),
+                    num_rows="dynamic", use_container_width=True, hide_index=True,
+                    key=f"grid_{submit_count}"
+                )
+                submitted = st.form_submit_button("Submit All / إرسال الكل")
+            athletes_data = grid_athletes(grid, shared, spec)
+            draft.num_players = 0
+            entered = bool(athletes_data)
+            if len(athletes_data) > MAX_PLAYERS:
+                st.error(f"🔴 At most {MAX_PLAYERS} players per submission / الحد الأقصى {MAX_PLAYERS} لاعب في المرة الواحدة")
+                athletes_data = []
+
+        else:
+            num_players = st.number_input(
+                BILINGUAL_LABELS["Number of players to add:"], min_value=1, max_value=MAX_PLAYERS, value=1
+            )
+            draft.num_players = num_players
+
+            for i in range(num_players):
+                suffix = f"_{submit_count}_{i}"
+                with st.expander(f"Player {i+1}"):
+                    athlete = {c: "" for c in BILINGUAL_COLS}
+                    athlete.update(shared)
+
+                    athlete["Athlete Name"] = st.text_input(BILINGUAL_LABELS["Athlete Name"], key=f"name{suffix}").strip()
+                    dob = st.date_input(BILINGUAL_LABELS["Date of Birth"], min_value=date(1960,1,1), max_value=date.today(), key=f"dob{suffix}")
+                    athlete["Date of Birth"] = str(dob)
+                    for field in spec.player_fields:
+                        athlete[field] = st.text_input(BILINGUAL_LABELS[field], key=f"{PLAYER_INPUTS[field]}{suffix}").strip()
+                    athlete["Sex"] = st.selectbox(BILINGUAL_LABELS["Sex"], SEX_OPTIONS, key=f"sex{suffix}")
+                    athlete["Belt Degree"] = st.selectbox(BILINGUAL_LABELS["Belt Degree"], BELT_OPTIONS, key=f"belt{suffix}")
+
+                    if spec.federations:
+                        athlete["Federation"] = st.selectbox(
+                            BILINGUAL_LABELS["Select Federation"],
+                            spec.federations,
+                            key=f"fed{suffix}"
+                        )
+
+                    # ✅ الوزن والطول فقط للاتحادات التي تطلبها في هذه البطولة (لجنة الجنرال)
+                    if athlete["Federation"] in spec.weight_height:
+                        weight = st.number_input(BILINGUAL_LABELS["Weight"], min_value=30.0, max_value=200.0, format="%.1f", key=f"weight{suffix}")
+                        height = st.number_input(BILINGUAL_LABELS["Height"], min_value=140, max_value=250, format="%d", key=f"height{suffix}")
+                        athlete["Weight"], athlete["Height"] = str(weight), str(height)
+
+                    if spec.has_competitions:
+                        comp_list = spec.competitions_for(athlete["Federation"])
+                        competitions = st.multiselect(BILINGUAL_LABELS["Competitions"], comp_list, key=f"comp{suffix}")
+                        athlete["Competitions"] = ", ".join(competitions)
+
+                    athletes_data.append(athlete)
+
+            entered = any(player_entered(a, spec) for a in athletes_data)
+
+    # المسودة تُمسح عند الخمول فقط إذا كُتب فيها شيء (القيم الافتراضية للـ widgets لا تُحسب)
+    draft.dirty = entered or any(v.strip() for v in draft.shared.values())
 
 # =====================================================
 # ---------------- Submit Button ----------------------
 # =====================================================
 
-if st.button("Submit All / إرسال الكل") and athletes_data:
-    df, _ = load_data()
-    errors = []
-
-    for athlete in athletes_data:
-        name = athlete["Athlete Name"]
-        belt = athlete["Belt Degree"]
-        club = athlete["Club"]
-        nationality = athlete["Nationality"]
-        coach = athlete["Coach Name"]
-        phone = athlete["Phone Number"]
-        competitions = athlete["Competitions"]
-        championship = athlete["Championship"]
-        weight = athlete.get("Weight", "")
-        height = athlete.get("Height", "")
-        federation = athlete.get("Federation", "")
-
-        if not name: errors.append("❌ Athlete name is required.")
-        if not belt: errors.append("❌ Belt degree is required.")
-        if not club: errors.append("❌ Club is required.")
-        if not nationality: errors.append("❌ Nationality is required.")
-
-        if not phone: 
-            errors.append("❌ Phone number is required.")
-        elif not validate_phone(phone):
-            errors.append("❌ Phone number format is invalid. Use: 01xxxxxxxxx")
+if registration_mode.startswith("Form"):
+    submitted = st.button("Submit All / إرسال الكل")
 
+if submitted and athletes_data:
+    with metrics.stage("validate"):
+        found = validate_batch(pd.DataFrame(athletes_data))
+    errors = [
+        f"❌ Player {row} ({athletes_data[row - 1]['Athlete Name'] or '—'}) — {error.removeprefix('❌ ')}"
+        for row, error in found[["Row", "Error"]].itertuples(index=False)
+    ]
 
     if errors:
         st.error("🔴 Fix the following errors:")
@@ -420,28 +558,26 @@ if st.button("Submit All / إرسال الكل") and athletes_data:
             st.write(f"• {e}")
     else:
         # حفظ البيانات
-        for athlete in athletes_data:
-            df = pd.concat([df, pd.DataFrame([athlete])], ignore_index=True)
-
-        save_data(df, athletes_data)
+        duplicates = save_data(athletes_data)
 
+    if not errors and duplicates:
+        st.error("🔴 Duplicate registrations — nothing was saved:")
+        for i, reason in duplicates.items():
+            st.write(f"• Player {i+1} ({athletes_data[i]['Athlete Name']}): {reason}")
+    elif not errors:
         st.success(f"✅ {len(athletes_data)} players registered successfully! ✓")
 
-        st.session_state.submit_count += 1
-        st.session_state.club = ""
-        st.session_state.nationality = ""
-        st.session_state.coach_name = ""
-        st.session_state.phone_number = ""
-
-        for key in list(st.session_state.keys()):
-            if any(prefix in key for prefix in ["name_", "dob_", "nat_", "phone_", "sex_", "belt_", "fed_", "fed_master_", "comp_", "weight_", "height_"]):
-                del st.session_state[key]
+        # حذف مفاتيح الدفعة الحالية بالاسم ثم بدء دفعة جديدة
+        for key in draft.widget_keys():
+            st.session_state.pop(key, None)
+        draft.clear()
 
         col1, col2 = st.columns(2)
         with col1:
             if st.button("➕ Add More Players / إضافة المزيد"):
                 st.rerun()
 
+        finish_rerun()
         st.stop()
 
 # =====================================================
@@ -453,26 +589,176 @@ admin_password = st.sidebar.text_input("Enter Admin Password", type="password")
 
 if admin_password == "mobadr90":
     st.sidebar.success("Logged in as Admin")
-    df, display_df = load_data()
-    if not df.empty:
+    store = get_store()
+    total_rows = store.count()
+    if total_rows:
         column_config = {
             bi_col: st.column_config.TextColumn(bi_col)
-            for eng_col, bi_col in BILINGUAL_COLS.items()
-            if bi_col in display_df.columns
+            for bi_col in BILINGUAL_COLS.values()
         }
-        st.dataframe(display_df, use_container_width=True, column_config=column_config)
 
-        try:
-            buffer = io.BytesIO()
-            df.to_excel(buffer, index=False, engine="openpyxl")
-            buffer.seek(0)
-            filename = st.session_state.get("selected_championship", "athletes").replace(" ", "_")
-            st.download_button(
-                "📥 Download Excel", buffer.getvalue(),
-                file_name=f"{filename}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        # ---------------- Filters / Search / Pagination ----------------
+        with st.expander("🔎 Filters / تصفية", expanded=False):
+            filter_cols = st.columns(len(FILTER_COLS))
+            filters = {
+                col: filter_cols[i].multiselect(BILINGUAL_COLS[col], store.distinct(col), key=f"filter_{col}")
+                for i, col in enumerate(FILTER_COLS)
+            }
+        search = st.text_input("Search name / coach / phone — بحث بالاسم / المدرب / الهاتف", key="admin_search")
+
+        p1, p2 = st.columns(2)
+        page_size = p1.selectbox("Rows per page / عدد الصفوف", [25, 50, 100, 500], index=1, key="admin_page_size")
+        page = st.session_state.get("admin_page", 1)
+        with metrics.stage("admin_query"):
+            page_df, matches = store.query(filters, search, limit=page_size, offset=(page - 1) * page_size)
+
+        pages = max(1, -(-matches // page_size))
+        if page > pages:
+            page = st.session_state.admin_page = pages
+            page_df, matches = store.query(filters, search, limit=page_size, offset=(page - 1) * page_size)
+        p2.number_input(f"Page / صفحة (1–{pages})", min_value=1, max_value=pages, key="admin_page")
+
+        start = (page - 1) * page_size
+        st.caption(f"Showing {min(start + 1, matches)}–{min(start + page_size, matches)} of {matches} (total {total_rows})")
+        st.dataframe(
+            page_df.rename(columns=BILINGUAL_COLS),
+            use_container_width=True, column_config=column_config
+        )
+
+        # ---------------- Possible Duplicates ----------------
+        if st.toggle("⚠️ Show possible duplicates / عرض التكرارات المحتملة", key="show_duplicates"):
+            df = load_data()
+            identity = get_identity_index()
+            identity.sync(df)
+            dup_df, groups = duplicates_frame(df, identity)
+            st.caption(f"{groups} athletes registered more than once ({len(dup_df)} rows)")
+            st.dataframe(dup_df.rename(columns=BILINGUAL_COLS), use_container_width=True, column_config=column_config)
+
+        # ---------------- Divisions ----------------
+        if st.toggle("🥋 Show divisions / عرض الفئات", key="show_divisions"):
+            df = load_data()
+            divisions = get_division_index(event_date())
+            with metrics.stage("divisions"):
+                divisions.sync(df)
+            sizes = divisions.sizes()
+            d1, d2, d3 = st.columns(3)
+            d1.metric("Divisions / الفئات", len(sizes))
+            d2.metric("Entries / المشاركات", int(sizes["Athletes"].sum()))
+            d3.metric("Single athlete / لاعب واحد", int((sizes["Athletes"] == 1).sum()))
+            champ_filter = st.selectbox(
+                BILINGUAL_COLS["Championship"], ["All / الكل"] + sorted(sizes["Championship"].unique()),
+                key="division_championship"
             )
-        except ImportError:
-            st.warning("📦 Install openpyxl: `pip install openpyxl`")
+            if champ_filter != "All / الكل":
+                sizes = sizes[sizes["Championship"] == champ_filter]
+            st.dataframe(sizes, use_container_width=True, hide_index=True)
+
+        # ---------------- Export (on demand) ----------------
+        export_kinds = {
+            "Excel": ("xlsx", None),
+            "Excel — sheet per Championship / ورقة لكل بطولة": ("xlsx", "Championship"),
+            "Excel — sheet per Federation / ورقة لكل اتحاد": ("xlsx", "Federation"),
+            "CSV (fast / سريع)": ("csv", None),
+            "Draw sheets — sheet per Championship / جداول القرعة": ("draw", "Championship"),
+        }
+        export_kind = st.selectbox("Export format / صيغة التصدير", list(export_kinds))
+        if st.button("⚙️ Prepare export / تجهيز الملف"):
+            st.session_state.export_kind = export_kind
+
+        if st.session_state.get("export_kind") == export_kind:
+            kind, split_by = export_kinds[export_kind]
+            ext = "csv" if kind == "csv" else "xlsx"
+            try:
+                # النسخة قبل التحميل: إذا أُضيفت صفوف بينهما يحتوي الإطار على أكثر من النسخة، وليس أقل
+                data_version = get_store().version()
+                df = load_data()
+                data = export_file(df, data_version, kind, split_by, event_date())
+                filename = st.session_state.get("selected_championship", "athletes").replace(" ", "_")
+                st.download_button(
+                    f"📥 Download {ext.upper()}", data,
+                    file_name=f"{filename}.{ext}",
+                    mime=EXCEL_MIME if ext == "xlsx" else CSV_MIME
+                )
+            except ImportError:
+                st.warning("📦 Install openpyxl: `pip install openpyxl`")
+
+    # ---------------- Google Sheet Sync Status ----------------
+    st.subheader("Google Sheet Sync / مزامنة جوجل شيت")
+    sync = get_sheet_sync()
+    status = sync.outbox.status()
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Pending / في الانتظار", status["pending"])
+    c2.metric("Retrying / إعادة المحاولة", status["retrying"])
+    c3.metric("Sent / تم الإرسال", status["sent"])
+    if status["last_sent_at"]:
+        st.caption(f"Last sent: {datetime.fromtimestamp(status['last_sent_at']):%Y-%m-%d %H:%M:%S}")
+    if status["oldest_pending_at"]:
+        waiting = time.time() - status["oldest_pending_at"]
+        st.caption(f"Oldest pending: waiting {waiting / 60:.0f} min (since {datetime.fromtimestamp(status['oldest_pending_at']):%Y-%m-%d %H:%M:%S})")
+    if status["last_error"]:
+        st.warning(f"Last error: {status['last_error']}")
+    if st.button("🔄 Sync now / مزامنة الآن"):
+        sync.wake()
+
+    reconciler = get_reconciler()
+    if st.button("🔍 Reconcile / مطابقة"):
+        try:
+            reconciler.run()
+            sync.wake()
+        except ReconcileError as e:
+            st.error(f"❌ {e}")
+    last = reconciler.last_run()
+    if last:
+        r1, r2 = st.columns(2)
+        r1.metric("Drift / فروقات", last["drift"])
+        r2.metric("Re-queued / أعيد إرسالها", last["pushed"])
+        st.caption(
+            f"Last reconcile: {datetime.fromtimestamp(last['at']):%Y-%m-%d %H:%M:%S} — "
+            f"first {last['watermark']} of {last['local_rows']} rows verified in sheet, "
+            f"{last['missing']} missing, {last['extra']} only in sheet"
+        )
+
+    # ---------------- Performance (KARATE_METRICS=1 only) ----------------
+    if metrics.enabled:
+        with st.expander("⏱ Performance / الأداء", expanded=False):
+            st.caption(f"Since {datetime.fromtimestamp(metrics.started):%Y-%m-%d %H:%M:%S} — times per rerun stage and per sheet POST")
+            st.dataframe(pd.DataFrame(metrics.summary()), use_container_width=True, hide_index=True)
+            m1, m2, m3 = st.columns(3)
+            m1.download_button("📥 Prometheus", metrics.to_prometheus(), file_name="karate_metrics.prom", mime="text/plain")
+            m2.download_button("📥 JSON", metrics.to_json(), file_name="karate_metrics.json", mime="application/json")
+            if m3.button("♻️ Reset / تصفير"):
+                metrics.reset()
+
+    # ---------------- Memory / Sessions ----------------
+    with st.expander("🧠 Memory / الذاكرة", expanded=False):
+        sessions = get_sessions().stats()
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Process RSS", f"{rss_bytes() / 2**20:.0f} MB")
+        m2.metric("Sessions / الجلسات", sessions["sessions"])
+        m3.metric("Draft players / لاعبين غير محفوظين", sessions["draft_players"])
+        m4.metric("This session", f"{deep_size(st.session_state.to_dict()) / 1024:.0f} KB")
+        st.caption(
+            f"{sessions['dirty']} with unsaved data, {sessions['idle']} idle — drafts idle for more than {SESSION_IDLE_SECONDS / 60:g} min are cleared "
+            f"({sessions['evicted']} so far); at most {MAX_PLAYERS} players per submission"
+        )
+
+        profiler = get_memory_profiler()
+        if profiler.enabled:
+            current, peak = profiler.traced()
+            st.caption(f"tracemalloc: {current / 2**20:.1f} MB now, {peak / 2**20:.1f} MB peak")
+            if st.button("📸 Snapshot / لقطة"):
+                profiler.take()
+            top = profiler.top()
+            if top:
+                st.write("Largest allocations / أكبر الحجوزات")
+                st.dataframe(pd.DataFrame(top).drop(columns="Δ KB"), use_container_width=True, hide_index=True)
+            growth = profiler.growth()
+            if growth:
+                st.write("Change since previous snapshot / التغير عن اللقطة السابقة")
+                st.dataframe(pd.DataFrame(growth), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Set KARATE_TRACEMALLOC=1 to record allocation snapshots / لتفعيل لقطات الذاكرة")
 else:
     st.sidebar.warning("Not logged in.")
+
+finish_rerun()
@@ -0,0 +1,87 @@
+import threading
+import time
+import weakref
+
+# =====================================================
+# ---------------- Session Drafts ----------------------
+# =====================================================
+#
+# كل جلسة لها Draft واحد في session_state بدلاً من مفاتيح منفصلة (النادي، الجنسية، المدرب، الهاتف، رقم الدفعة)،
+# ومفاتيح الـ widgets لكل لاعب تُحسب من (الحقل, رقم الدفعة, رقم اللاعب) — تُحذف بالاسم بدون البحث في كل المفاتيح.
+# SessionRegistry يحتفظ بـ weakref لكل Draft (يختفي تلقائياً عندما يحذف streamlit الجلسة).
+# المسح عند الخمول يتم داخل الجلسة نفسها (fragment كل SWEEP_INTERVAL في rr.py): expire() يمسح المسودة
+# ثم rerun كامل يعرض widgets بمفاتيح الدفعة الجديدة، فيحذف streamlit قيم الـ widgets القديمة من الجلسة
+# والمتصفح لا يرسلها مرة أخرى — بدون ذلك تبقى بيانات اللاعبين في session_state لأن التاب المتروك لا يعمل rerun.
+
+PLAYER_WIDGETS = ("name", "dob", "nat", "pcoach", "phone", "sex", "belt", "fed", "weight", "height", "comp")
+
+IDLE_SECONDS = 30 * 60
+SWEEP_INTERVAL = 60.0
+MAX_PLAYERS = 50
+
+
+class Draft:
+    """One session's unsaved registration: shared fields, player count and batch number."""
+
+    __slots__ = ("submit_count", "num_players", "shared", "dirty", "last_seen", "expired", "__weakref__")
+
+    def __init__(self):
+        self.submit_count = 0
+        self.num_players = 0
+        self.shared = {}
+        self.dirty = False          # كتب المستخدم بيانات في المسودة (تُحدّث في كل rerun)
+        self.last_seen = time.monotonic()
+        self.expired = False
+
+    def key(self, widget, i):
+        return f"{widget}_{self.submit_count}_{i}"
+
+    def widget_keys(self):
+        return [self.key(w, i) for i in range(self.num_players) for w in PLAYER_WIDGETS]
+
+    def clear(self):
+        """Forget the entered values; the next batch renders with fresh widget keys."""
+        self.shared = {}
+        self.num_players = 0
+        self.dirty = False
+        self.submit_count += 1
+
+
+class SessionRegistry:
+    """Process-wide view of every live session's draft, with idle eviction."""
+
+    def __init__(self, idle_seconds=IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self.lock = threading.Lock()
+        self.drafts = weakref.WeakSet()
+        self.evicted = 0
+
+    def touch(self, draft):
+        """Register ``draft`` as active now; returns True once if it was evicted while idle."""
+        with self.lock:
+            self.drafts.add(draft)
+            expired, draft.expired = draft.expired, False
+            draft.last_seen = time.monotonic()
+        return expired
+
+    def expire(self, draft):
+        """Clear ``draft`` if it holds entered data and has been idle too long; the caller must rerun the page."""
+        with self.lock:
+            if not draft.dirty or time.monotonic() - draft.last_seen <= self.idle_seconds:
+                return False
+            draft.clear()
+            draft.expired = True
+            self.evicted += 1
+            return True
+
+    def stats(self):
+        now = time.monotonic()
+        with self.lock:
+            drafts = list(self.drafts)
+            return {
+                "sessions": len(drafts),
+                "idle": sum(now - d.last_seen > self.idle_seconds for d in drafts),
+                "draft_players": sum(d.num_players for d in drafts),
+                "dirty": sum(d.dirty for d in drafts),
+                "evicted": self.evicted,
+            }
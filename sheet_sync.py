@@ -0,0 +1,238 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import StageMetrics
+
+# =====================================================
+# ---------------- Google Sheet Outbox -----------------
+# =====================================================
+#
+# الإرسال لجوجل شيت لا يتم أثناء الـ submit.
+# save_data يضيف اللاعبين إلى outbox (SQLite على القرص) ويرجع فوراً،
+# و SheetSyncWorker يرسلهم في الخلفية على دفعات مع timeout و retry/backoff.
+
+OUTBOX_FILE = Path("sheet_outbox.sqlite3")
+
+BATCH_SIZE = 25
+TIMEOUT = (3.05, 15)          # (connect, read) بالثواني
+POLL_INTERVAL = 2.0
+BASE_BACKOFF = 2.0
+MAX_BACKOFF = 300.0
+LEASE_SECONDS = 60.0
+KEEP_SENT_SECONDS = 7 * 24 * 3600
+
+
+class Outbox:
+    """Durable queue of player payloads waiting to be sent to the sheet."""
+
+    def __init__(self, path=OUTBOX_FILE):
+        self.path = Path(path)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+                    payload         TEXT    NOT NULL,
+                    created_at      REAL    NOT NULL,
+                    attempts        INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL    NOT NULL DEFAULT 0,
+                    leased_until    REAL    NOT NULL DEFAULT 0,
+                    last_error      TEXT,
+                    sent_at         REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (sent_at, next_attempt_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=FULL")
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, players):
+        now = time.time()
+        rows = [(json.dumps(p, ensure_ascii=False), now) for p in players]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("INSERT INTO outbox (payload, created_at) VALUES (?, ?)", rows)
+            conn.execute("COMMIT")
+
+    def lease_batch(self, limit=BATCH_SIZE):
+        """Claim up to ``limit`` due items so no other worker sends them concurrently."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("""
+                SELECT id, payload FROM outbox
+                WHERE sent_at IS NULL AND next_attempt_at <= ? AND leased_until <= ?
+                ORDER BY id LIMIT ?
+            """, (now, now, limit)).fetchall()
+            conn.executemany(
+                "UPDATE outbox SET leased_until = ? WHERE id = ?",
+                [(now + LEASE_SECONDS, r[0]) for r in rows]
+            )
+            conn.execute("COMMIT")
+        return [(row_id, json.loads(payload)) for row_id, payload in rows]
+
+    def mark_sent(self, ids):
+        if not ids:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE outbox SET sent_at = ?, leased_until = 0, last_error = NULL WHERE id = ?",
+                [(now, i) for i in ids]
+            )
+            conn.execute("DELETE FROM outbox WHERE sent_at < ?", (now - KEEP_SENT_SECONDS,))
+
+    def mark_failed(self, ids, error):
+        """Release ``ids`` with exponential backoff based on each item's attempts."""
+        if not ids:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany("""
+                UPDATE outbox
+                SET attempts = attempts + 1,
+                    leased_until = 0,
+                    last_error = ?,
+                    next_attempt_at = ? + MIN(?, ? * (1 << MIN(attempts, 16)))
+                WHERE id = ?
+            """, [(error, now, MAX_BACKOFF, BASE_BACKOFF, i) for i in ids])
+
+    def release(self, ids):
+        """Give leased ``ids`` back without counting an attempt (e.g. the worker is stopping)."""
+        if not ids:
+            return
+        with self._connect() as conn:
+            conn.executemany("UPDATE outbox SET leased_until = 0 WHERE id = ?", [(i,) for i in ids])
+
+    def pending(self):
+        """Payloads not delivered yet (queued, leased or retrying)."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT payload FROM outbox WHERE sent_at IS NULL ORDER BY id").fetchall()
+        return [json.loads(payload) for payload, in rows]
+
+    def get_state(self, key, default=None):
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key, value):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value, ensure_ascii=False))
+            )
+
+    def status(self):
+        with self._connect() as conn:
+            pending, retrying, sent, oldest, last_sent = conn.execute("""
+                SELECT
+                    SUM(sent_at IS NULL),
+                    SUM(sent_at IS NULL AND attempts > 0),
+                    SUM(sent_at IS NOT NULL),
+                    MIN(CASE WHEN sent_at IS NULL THEN created_at END),
+                    MAX(sent_at)
+                FROM outbox
+            """).fetchone()
+            last_error = conn.execute("""
+                SELECT last_error FROM outbox
+                WHERE sent_at IS NULL AND last_error IS NOT NULL
+                ORDER BY id DESC LIMIT 1
+            """).fetchone()
+        return {
+            "pending": pending or 0,
+            "retrying": retrying or 0,
+            "sent": sent or 0,
+            "oldest_pending_at": oldest,
+            "last_sent_at": last_sent,
+            "last_error": last_error[0] if last_error else None,
+        }
+
+
+# =====================================================
+# ---------------- Background Worker -------------------
+# =====================================================
+
+def make_session(pool_size=4):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class SheetSyncWorker(threading.Thread):
+    """Drains the outbox in batches over one pooled ``requests.Session``."""
+
+    def __init__(self, outbox, url, batch_size=BATCH_SIZE, timeout=TIMEOUT, poll_interval=POLL_INTERVAL, metrics=None):
+        super().__init__(name="sheet-sync", daemon=True)
+        self.outbox = outbox
+        self.metrics = metrics or StageMetrics()
+        self.url = url
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.session = make_session()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+
+    def post(self, player):
+        with self.metrics.stage("sheet_post"):
+            response = self.session.post(self.url, json=player, timeout=self.timeout)
+        if response.status_code != 200:
+            raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+
+    def drain_once(self):
+        """Send one batch. Returns the number of rows delivered."""
+        batch = self.outbox.lease_batch(self.batch_size)
+        sent = []
+        for i, (row_id, player) in enumerate(batch):
+            if self._stop_event.is_set():
+                # الإيقاف أثناء الدفعة: الباقي يُعاد للـ outbox فوراً بدلاً من انتظار LEASE_SECONDS
+                self.outbox.mark_sent(sent)
+                self.outbox.release([r for r, _ in batch[i:]])
+                return len(sent)
+            try:
+                self.post(player)
+            except requests.RequestException as e:
+                # غالباً الـ endpoint متوقف — نؤجل باقي الدفعة بالكامل
+                print("Google Sheet Error:", e)
+                self.outbox.mark_sent(sent)
+                self.outbox.mark_failed([r for r, _ in batch[i:]], str(e))
+                return len(sent)
+            sent.append(row_id)
+        self.outbox.mark_sent(sent)
+        return len(sent)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                delivered = self.drain_once()
+            except Exception as e:
+                print("Sheet sync worker error:", e)
+                delivered = 0
+            if delivered == self.batch_size:
+                continue    # ما زال هناك المزيد
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
@@ -0,0 +1,569 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from admin_query import SEARCH_COLS, AthleteIndex
+from frames import as_text, concat_typed, typed
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # بدون pyarrow: لا يوجد snapshot ونقرأ الـ CSV فقط
+    pa = pq = None
+
+try:
+    import fcntl
+except ImportError:  # Windows — نكتفي بقفل الخيوط داخل العملية
+    fcntl = None
+
+# =====================================================
+# ---------------- CSV Store ---------------------------
+# =====================================================
+#
+# الملف الأساسي athletes_data.csv لا يُعاد كتابته عند كل تسجيل.
+# التسجيلات الجديدة تُضاف إلى ملف journal (append + fsync) تحت قفل حصري،
+# ثم تقوم خطوة compaction في الخلفية بدمج الـ journal في الملف الأساسي.
+#
+#   athletes_data.csv              <- الملف الأساسي (له header)
+#   athletes_data.csv.journal      <- صفوف جديدة بدون header بترتيب الأعمدة
+#   athletes_data.csv.compacting   <- journal قيد الدمج
+#   athletes_data.csv.lock         <- ملف القفل
+#   athletes_data.parquet          <- snapshot مضغوط للملف الأساسي لتحميل سريع عند بدء التشغيل
+
+# نفس ترتيب BILINGUAL_COLS في rr.py
+COLUMNS = [
+    "Championship", "Athlete Name", "Club", "Nationality", "Coach Name", "Phone Number",
+    "Date of Birth", "Sex", "Belt Degree", "Weight", "Height", "Competitions", "Federation"
+]
+
+COMPACT_BYTES = 1_000_000
+SNAPSHOT_KEY = b"athletes_base_key"
+
+
+class CsvStore:
+    """Append-only CSV storage with a journal and background compaction."""
+
+    def __init__(self, path, columns, compact_bytes=COMPACT_BYTES):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.compact_bytes = compact_bytes
+        self.journal_path = self._sibling(".journal")
+        self.compacting_path = self._sibling(".compacting")
+        self.lock_path = self._sibling(".lock")
+        self.snapshot_path = self.path.with_suffix(".parquet")
+        self._thread_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._cache = None
+        self._index = None
+        self._compactor = None
+        self._compactor_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+
+    def _sibling(self, suffix):
+        return self.path.with_name(self.path.name + suffix)
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock:
+            with open(self.lock_path, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    # ---------------- Write ----------------
+
+    def append(self, rows):
+        """Append new athlete dicts to the journal. Cost is O(len(rows))."""
+        if not rows:
+            return
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_cell(row.get(c, "")) for c in self.columns])
+        data = buffer.getvalue().encode("utf-8")
+
+        with self._locked():
+            with open(self.journal_path, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            journal_size = self.journal_path.stat().st_size
+
+        if journal_size >= self.compact_bytes:
+            self.compact_in_background()
+
+    # ---------------- Read -----------------
+
+    def _snapshot(self):
+        # نفتح الملفات تحت القفل فقط (O(1)) ثم نقرأها بعد تحريره؛
+        # الـ file handles تبقى صالحة حتى لو تم استبدال الملفات أثناء الـ compaction.
+        snapshot = {}
+        with self._locked():
+            for name, p in (("base", self.path), ("compacting", self.compacting_path), ("journal", self.journal_path)):
+                if p.exists():
+                    f = open(p, "rb")
+                    st = os.fstat(f.fileno())
+                    snapshot[name] = (f, (st.st_ino, st.st_mtime_ns, st.st_size))
+        return snapshot
+
+    def version(self):
+        """Cheap version key of the data: (inode, mtime, size) of every file."""
+        key = []
+        for p in (self.path, self.compacting_path, self.journal_path):
+            try:
+                st = p.stat()
+                key.append((st.st_ino, st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                key.append(None)
+        return tuple(key)
+
+    def load(self):
+        """Return every registration (base file + pending journals) as one frame.
+
+        The frame is cached and shared between sessions — callers must not
+        mutate it. If only the journal grew since the last call, only the new
+        tail is parsed.
+        """
+        snapshot = self._snapshot()
+        try:
+            return self._load_snapshot(snapshot)
+        finally:
+            for f, _ in snapshot.values():
+                f.close()
+
+    def _load_snapshot(self, snapshot):
+        base_key = snapshot["base"][1] if "base" in snapshot else None
+        comp_key = snapshot["compacting"][1] if "compacting" in snapshot else None
+        journal_ino, journal_size = None, 0
+        if "journal" in snapshot:
+            journal_ino, _, journal_size = snapshot["journal"][1]
+
+        with self._cache_lock:
+            cache = self._cache
+        if (
+            cache is not None
+            and cache["base"] == base_key
+            and cache["compacting"] == comp_key
+            and cache["journal_ino"] in (journal_ino, None)
+            and cache["journal_size"] <= journal_size
+        ):
+            if cache["journal_size"] == journal_size:
+                return cache["df"]
+            # الـ journal كبر فقط — نقرأ الجزء الجديد
+            f = snapshot["journal"][0]
+            f.seek(cache["journal_size"])
+            tail = self._conform(self._read_journal(f.read(journal_size - cache["journal_size"])))
+            df = concat_typed([cache["df"], tail])
+        else:
+            frames = []
+            if "base" in snapshot:
+                f, key = snapshot["base"]
+                # الـ parquet snapshot أسرع بكثير من تحليل الـ CSV إذا كان مطابقاً للملف الأساسي
+                base = self._read_parquet_snapshot(key)
+                if base is None:
+                    base = self._conform(_read_base(f.read(key[2])))
+                    if len(base):
+                        self._write_parquet_snapshot(base, key)
+                frames.append(base)
+            for name in ("compacting", "journal"):
+                if name in snapshot:
+                    f, key = snapshot[name]
+                    data = f.read(key[2])
+                    if data:
+                        frames.append(self._conform(self._read_journal(data)))
+            df = concat_typed(frames) if frames else self._conform(None)
+
+        with self._cache_lock:
+            self._cache = {
+                "base": base_key,
+                "compacting": comp_key,
+                "journal_ino": journal_ino,
+                "journal_size": journal_size,
+                "df": df,
+            }
+        return df
+
+    # ---------------- Admin Queries --------
+
+    def index(self):
+        """AthleteIndex over the current frame, rebuilt only when the data changes."""
+        df = self.load()
+        index = self._index
+        if index is None or index.df is not df:
+            index = AthleteIndex(df)
+            self._index = index
+        return index
+
+    def count(self):
+        return len(self.load())
+
+    def distinct(self, col):
+        return self.index().options(col)
+
+    def query(self, filters=None, text="", limit=50, offset=0):
+        """Return (page frame, total matches) for the admin table."""
+        index = self.index()
+        rows = index.query(filters, text)
+        return index.df.iloc[rows[offset:offset + limit]], len(rows)
+
+    def _conform(self, df):
+        # تأكيد وجود جميع الأعمدة ثم تحويلها إلى الأنواع المضغوطة (categorical / رقم / تاريخ)
+        if df is None:
+            df = pd.DataFrame(columns=self.columns)
+        missing = [c for c in self.columns if c not in df.columns]
+        if missing:
+            df = df.assign(**{c: "" for c in missing})
+        return typed(df.fillna(""))
+
+    # ---------------- Parquet Snapshot -----
+
+    def _snapshot_matches(self, base_key):
+        try:
+            meta = pq.read_schema(self.snapshot_path).metadata or {}
+        except (OSError, pa.ArrowException):
+            return False    # غير موجود أو تالف — يُعاد كتابته
+        return json.loads(meta.get(SNAPSHOT_KEY, b"null")) == list(base_key)
+
+    def _read_parquet_snapshot(self, base_key):
+        if pq is None:
+            return None
+        try:
+            if not self._snapshot_matches(base_key):
+                return None
+            return pd.read_parquet(self.snapshot_path)
+        except Exception as e:
+            print("Parquet snapshot error:", e)
+            return None
+
+    def _write_parquet_snapshot(self, df, base_key):
+        if pq is None:
+            return
+        # كاتب واحد في نفس الوقت؛ إذا كتب thread (أو عملية) آخر snapshot لنفس الملف الأساسي نتخطى الكتابة
+        with self._snapshot_lock:
+            tmp_path = _tmp_path(self.snapshot_path)
+            try:
+                if self._snapshot_matches(base_key):
+                    return
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                meta = dict(table.schema.metadata or {})
+                meta[SNAPSHOT_KEY] = json.dumps(list(base_key)).encode()
+                pq.write_table(table.replace_schema_metadata(meta), tmp_path)
+                os.replace(tmp_path, self.snapshot_path)
+            except Exception as e:
+                print("Parquet snapshot error:", e)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+    def _read_journal(self, data):
+        return pd.read_csv(
+            io.BytesIO(data),
+            header=None,
+            names=self.columns,
+            dtype=str,
+            keep_default_na=False,
+            encoding="utf-8",
+            encoding_errors="replace",
+            on_bad_lines="skip"
+        )
+
+    # ---------------- Compaction -----------
+
+    def compact_in_background(self):
+        # الفحص والتشغيل تحت قفل واحد — compactor واحد فقط لكل store في نفس الوقت
+        with self._compactor_lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(target=self.compact, name="csv-compactor", daemon=True)
+            self._compactor.start()
+
+    def compact(self):
+        """Merge the journal into the base file with an atomic replace."""
+        with self._locked():
+            # compacting موجود = compaction سابق لم يكتمل، ندمجه أولاً
+            if not self.compacting_path.exists():
+                if not self.journal_path.exists() or self.journal_path.stat().st_size == 0:
+                    return
+                os.replace(self.journal_path, self.compacting_path)
+            before = self.version()
+
+        # القراءة والكتابة خارج القفل — الـ append يستمر على journal جديد
+        base = _read_base(self.path.read_bytes()) if self.path.exists() else pd.DataFrame(columns=self.columns)
+        pending = self._read_journal(self.compacting_path.read_bytes())
+        merged = pd.concat([base, pending], ignore_index=True)
+        ordered = self.columns + [c for c in merged.columns if c not in self.columns]
+        merged = merged.reindex(columns=ordered).fillna("")
+
+        tmp_path = _tmp_path(self.path)
+        try:
+            with open(tmp_path, "x", encoding="utf-8", newline="") as f:
+                merged.to_csv(f, index=False)
+                f.flush()
+                os.fsync(f.fileno())
+            st = tmp_path.stat()
+            self._write_parquet_snapshot(self._conform(merged), (st.st_ino, st.st_mtime_ns, st.st_size))
+
+            with self._locked():
+                current = self.version()
+                if current[:2] != before[:2]:
+                    # عملية أخرى أنهت الـ compaction قبلنا
+                    return
+                os.replace(tmp_path, self.path)
+                self.compacting_path.unlink()
+                after = self.version()
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        # نفس الصفوف بنفس الترتيب — الـ cache يبقى صالحاً بمفاتيح الملفات الجديدة
+        with self._cache_lock:
+            cache = self._cache
+            if cache is None or cache["base"] != before[0]:
+                return
+            if cache["compacting"] == before[1]:
+                cache["base"], cache["compacting"] = after[0], None
+            elif (
+                cache["compacting"] is None
+                and before[1] is not None
+                and (cache["journal_ino"], cache["journal_size"]) == (before[1][0], before[1][2])
+            ):
+                # الـ cache كان يغطي الـ journal القديم بالكامل (قبل تحويله إلى compacting)
+                cache["base"], cache["compacting"] = after[0], None
+                cache["journal_ino"], cache["journal_size"] = None, 0
+
+
+# =====================================================
+# ---------------- SQLite Store ------------------------
+# =====================================================
+#
+# نفس واجهة CsvStore ولكن على SQLite (WAL):
+# كل submit هو transaction واحد من inserts، والاستعلامات تقرأ فقط ما تحتاجه.
+
+INDEXED_COLUMNS = {
+    "championship": ("Championship",),
+    "club": ("Club",),
+    "phone": ("Phone Number",),
+    "identity": ("Athlete Name", "Date of Birth"),
+}
+
+
+def sql_name(col):
+    return col.lower().replace(" ", "_")
+
+
+class SqliteStore:
+    """Athlete registrations in an SQLite database (WAL mode)."""
+
+    def __init__(self, path, columns, migrate_from=None):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.sql_columns = [sql_name(c) for c in self.columns]
+        self._cache_lock = threading.Lock()
+        self._cache = None
+        self._init_schema()
+        if migrate_from is not None:
+            self.migrate_from_csv(migrate_from)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        cols = ",\n".join(f"{c} TEXT NOT NULL DEFAULT ''" for c in self.sql_columns)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS athletes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    {cols},
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            for name, cols in INDEXED_COLUMNS.items():
+                if all(c in self.columns for c in cols):
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS athletes_{name} ON athletes "
+                        f"({', '.join(sql_name(c) for c in cols)})"
+                    )
+
+    # ---------------- Write ----------------
+
+    def append(self, rows):
+        if not rows:
+            return
+        now = time.time()
+        placeholders = ", ".join("?" * (len(self.columns) + 1))
+        values = [[_cell(row.get(c, "")) for c in self.columns] + [now] for row in rows]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                f"INSERT INTO athletes ({', '.join(self.sql_columns)}, created_at) VALUES ({placeholders})",
+                values
+            )
+            conn.execute("COMMIT")
+
+    def migrate_from_csv(self, csv_path):
+        """One-shot import of an existing CSV (and its journal) into an empty database."""
+        with self._connect() as conn:
+            done = conn.execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone()
+            has_rows = conn.execute("SELECT 1 FROM athletes LIMIT 1").fetchone()
+        if done or has_rows:
+            return 0
+
+        df = CsvStore(csv_path, self.columns).load()
+        if df.empty:
+            return 0
+        text = pd.DataFrame({c: as_text(df[c]) for c in self.columns})
+        placeholders = ", ".join("?" * (len(self.columns) + 1))
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                f"INSERT INTO athletes ({', '.join(self.sql_columns)}, created_at) VALUES ({placeholders})",
+                (list(row) + [now] for row in text.itertuples(index=False, name=None))
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)",
+                (str(Path(csv_path).resolve()),)
+            )
+            conn.execute("COMMIT")
+        return len(df)
+
+    # ---------------- Read -----------------
+
+    def version(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM athletes").fetchone()
+
+    def _frame(self, conn, sql, params=()):
+        cur = conn.execute(sql, params)
+        names = [d[0] for d in cur.description]
+        df = pd.DataFrame(cur.fetchall(), columns=names)
+        return df.rename(columns=dict(zip(self.sql_columns, self.columns)))
+
+    def load(self):
+        """Every registration as one frame; only rows added since the last call are read."""
+        select = f"SELECT id, {', '.join(self.sql_columns)} FROM athletes WHERE id > ? ORDER BY id"
+        with self._cache_lock:
+            cache = self._cache
+        last_id = cache["last_id"] if cache else 0
+        with self._connect() as conn:
+            new = self._frame(conn, select, (last_id,))
+
+        if cache is not None and new.empty:
+            return cache["df"]
+        if not new.empty:
+            last_id = int(new["id"].iloc[-1])
+        new = typed(new.drop(columns="id"))
+        df = concat_typed([cache["df"], new]) if cache is not None else new
+
+        with self._cache_lock:
+            if self._cache is None or self._cache["last_id"] <= last_id:
+                self._cache = {"last_id": last_id, "df": df}
+        return df
+
+    # ---------------- Admin Queries --------
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM athletes").fetchone()[0]
+
+    def distinct(self, col):
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT {sql_name(col)} FROM athletes WHERE {sql_name(col)} != '' ORDER BY 1"
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def query(self, filters=None, text="", limit=50, offset=0):
+        """Return (page frame, total matches) reading only the requested page."""
+        where, params = [], []
+        for col, values in (filters or {}).items():
+            if values:
+                where.append(f"{sql_name(col)} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        text = text.strip().lower()
+        if text:
+            where.append("(" + " OR ".join(f"lower({sql_name(c)}) LIKE ?" for c in SEARCH_COLS) + ")")
+            params.extend([f"%{text}%"] * len(SEARCH_COLS))
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM athletes {clause}", params).fetchone()[0]
+            page = self._frame(
+                conn,
+                f"SELECT {', '.join(self.sql_columns)} FROM athletes {clause} ORDER BY id LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            )
+        return page, total
+
+    def to_csv(self, path):
+        self.load().to_csv(path, index=False)
+
+
+def _cell(value):
+    return "" if value is None else str(value)
+
+
+def _tmp_path(path):
+    # اسم مؤقت فريد لكل عملية ولكل thread — لا يكتب كاتبان على نفس الملف المؤقت أبداً
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _read_base(data):
+    if not data.strip():
+        return pd.DataFrame()
+    try:
+        return pd.read_csv(
+            io.BytesIO(data),
+            dtype=str,
+            keep_default_na=False,
+            encoding="utf-8",
+            encoding_errors="replace",
+            on_bad_lines="skip"     # تخطي أي سطر تالف
+        )
+    except Exception:
+        return pd.read_csv(
+            io.BytesIO(data),
+            dtype=str,
+            keep_default_na=False,
+            encoding="latin-1",
+            encoding_errors="replace",
+            on_bad_lines="skip"
+        )
+
+
+# =====================================================
+# ---------------- CLI ---------------------------------
+# =====================================================
+#
+#   python storage.py migrate athletes_data.csv athletes_data.sqlite3
+#   python storage.py export-csv athletes_data.sqlite3 athletes_export.csv
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("migrate", "export-csv"):
+        sys.exit("usage: python storage.py migrate CSV DB | export-csv DB CSV")
+
+    if sys.argv[1] == "migrate":
+        n = SqliteStore(sys.argv[3], COLUMNS).migrate_from_csv(sys.argv[2])
+        print(f"Migrated {n} rows into {sys.argv[3]}")
+    else:
+        SqliteStore(sys.argv[2], COLUMNS).to_csv(sys.argv[3])
+        print(f"Exported {sys.argv[2]} to {sys.argv[3]}")
@@ -0,0 +1,161 @@
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from options import (
+    BELT_OPTIONS, SEX_ONLY_COMPETITIONS, SEX_OPTIONS, STORED_CHAMPIONSHIPS, VALID_COMPETITIONS,
+    VALID_FEDERATIONS, WEIGHT_HEIGHT
+)
+
+# =====================================================
+# ---------------- Batch Validation --------------------
+# =====================================================
+#
+# التحقق من دفعة كاملة من اللاعبين (DataFrame) مرة واحدة بعمليات vectorized
+# ويرجع جدول أخطاء: Row / Field / Error — يستخدمه النموذج ورفع الملف.
+
+REQUIRED_FIELDS = ("Athlete Name", "Belt Degree", "Club", "Nationality", "Phone Number", "Date of Birth")
+PHONE_PATTERN = re.compile(r"01[0-9]{9}")
+
+WEIGHT_RANGE = (30.0, 200.0)
+HEIGHT_RANGE = (140.0, 250.0)
+
+# حد عام لاكتشاف تواريخ الميلاد الخاطئة (بالسنوات في يوم التحقق)؛
+# حدود السن لكل بطولة / كورس تأتي من age_range في championships.json
+AGE_RANGE = (4, 90)
+
+ERROR_COLUMNS = ["Row", "Field", "Error"]
+
+# جداول البحث من championships.json (تُبنى مرة واحدة عند تحميل الـ module)
+# بقيم بدون مسافات في الأطراف لأن القيم المدخلة تُقارن بعد strip
+
+
+def _stripped(keys):
+    keys = sorted({tuple(k.strip() for k in key) for key in keys})
+    return pd.MultiIndex.from_tuples(keys) if keys else None
+
+
+_CHAMPIONSHIPS = [name.strip() for name in STORED_CHAMPIONSHIPS]
+_FEDERATION_CHAMPS = [name.strip() for name, spec in STORED_CHAMPIONSHIPS.items() if spec.federations]
+_NO_COMPETITIONS = [name.strip() for name, spec in STORED_CHAMPIONSHIPS.items() if not spec.has_competitions]
+_VALID_FEDERATIONS = _stripped(VALID_FEDERATIONS)
+_WEIGHT_HEIGHT = _stripped(WEIGHT_HEIGHT)
+_VALID_COMPETITIONS = _stripped(VALID_COMPETITIONS)
+_SEX_ONLY_COMPETITIONS = {c.strip(): sex for c, sex in SEX_ONLY_COMPETITIONS.items()}
+_AGE_MIN = {name.strip(): spec.age_range[0] for name, spec in STORED_CHAMPIONSHIPS.items() if spec.age_range}
+_AGE_MAX = {name.strip(): spec.age_range[1] for name, spec in STORED_CHAMPIONSHIPS.items() if spec.age_range}
+
+
+def _isin(index, table):
+    return index.isin(table) if table is not None else np.zeros(len(index), dtype=bool)
+
+
+def _errors(mask, field, message):
+    return np.flatnonzero(np.asarray(mask)), field, message
+
+
+def _text(df, col):
+    if col not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[col].fillna("").astype(str).str.strip()
+
+
+def _age_on(dob, today):
+    before_birthday = (dob.dt.month > today.month) | ((dob.dt.month == today.month) & (dob.dt.day > today.day))
+    return today.year - dob.dt.year - before_birthday.astype(int)
+
+
+def validate_batch(df, today=None):
+    """Validate every athlete in ``df``; returns a (Row, Field, Error) frame, empty if all valid."""
+    today = today or date.today()
+    df = df.reset_index(drop=True)
+    found = []
+
+    # ---------------- Required ----------------
+    for field in REQUIRED_FIELDS:
+        found.append(_errors(_text(df, field) == "", field, f"❌ {field} is required."))
+
+    # ---------------- Phone ----------------
+    phone = _text(df, "Phone Number")
+    found.append(_errors(
+        (phone != "") & ~phone.str.fullmatch(PHONE_PATTERN),
+        "Phone Number", "❌ Phone number format is invalid. Use: 01xxxxxxxxx"
+    ))
+
+    # ---------------- Fixed vocabularies ----------------
+    belt = _text(df, "Belt Degree")
+    found.append(_errors((belt != "") & ~belt.isin(BELT_OPTIONS), "Belt Degree", "❌ Unknown belt degree."))
+    sex = _text(df, "Sex")
+    found.append(_errors(~sex.isin(SEX_OPTIONS), "Sex", "❌ Sex must be Male or Female."))
+
+    championship = _text(df, "Championship")
+    known = championship.isin(_CHAMPIONSHIPS)
+    found.append(_errors(~known, "Championship", "❌ Unknown championship."))
+
+    federation = _text(df, "Federation")
+    has_federation = championship.isin(_FEDERATION_CHAMPS)
+    pair = pd.MultiIndex.from_arrays([championship, federation])
+    bad_federation = has_federation & ~_isin(pair, _VALID_FEDERATIONS)
+    found.append(_errors(bad_federation, "Federation", "❌ Select a federation."))
+
+    # ---------------- Weight / Height ----------------
+    united = _isin(pair, _WEIGHT_HEIGHT)
+    for field, (low, high) in (("Weight", WEIGHT_RANGE), ("Height", HEIGHT_RANGE)):
+        raw = _text(df, field)
+        value = pd.to_numeric(raw, errors="coerce")
+        found.append(_errors(united & (raw == ""), field, f"❌ {field} is required for this federation."))
+        found.append(_errors(
+            (raw != "") & ~value.between(low, high),
+            field, f"❌ {field} must be between {low:g} and {high:g}."
+        ))
+
+    # ---------------- Age vs course ----------------
+    raw_dob = _text(df, "Date of Birth")
+    dob = pd.to_datetime(raw_dob.str[:10], errors="coerce", format="%Y-%m-%d")
+    found.append(_errors((raw_dob != "") & dob.isna(), "Date of Birth", "❌ Date of birth is invalid (YYYY-MM-DD)."))
+    age = _age_on(dob, today)
+    found.append(_errors(
+        dob.notna() & ~age.between(*AGE_RANGE),
+        "Date of Birth", f"❌ Age must be between {AGE_RANGE[0]} and {AGE_RANGE[1]}."
+    ))
+    if _AGE_MIN:
+        low, high = championship.map(_AGE_MIN), championship.map(_AGE_MAX)
+        found.append(_errors(
+            dob.notna() & low.notna() & ~age.between(low, high),
+            "Date of Birth", "❌ Age is outside the range allowed for this championship / course."
+        ))
+
+    # ---------------- Competitions ----------------
+    no_competitions = championship.isin(_NO_COMPETITIONS)
+    competitions = _text(df, "Competitions")
+    found.append(_errors(
+        no_competitions & (competitions != ""), "Competitions", "❌ This championship has no competitions."
+    ))
+
+    checked = known & ~bad_federation & ~no_competitions & (competitions != "")
+    picked = competitions[checked].str.split(",", regex=False).explode().str.strip()
+    if not picked.empty:
+        rows = picked.index.to_numpy()
+        federation_key = federation.where(has_federation, "").to_numpy()[rows]
+        allowed = _isin(pd.MultiIndex.from_arrays(
+            [championship.to_numpy()[rows], federation_key, picked.to_numpy()]
+        ), _VALID_COMPETITIONS)
+        bad = np.zeros(len(df), dtype=bool)
+        bad[rows[~allowed]] = True
+        found.append(_errors(bad, "Competitions", "❌ Competition not available for this championship / federation."))
+
+        required_sex = picked.map(_SEX_ONLY_COMPETITIONS)
+        wrong_sex = required_sex.notna().to_numpy() & (required_sex.to_numpy() != sex.to_numpy()[rows])
+        bad = np.zeros(len(df), dtype=bool)
+        bad[rows[wrong_sex]] = True
+        found.append(_errors(bad, "Competitions", "❌ Competition does not match the athlete's sex."))
+
+    rows = np.concatenate([r for r, _, _ in found])
+    errors = pd.DataFrame({
+        "Row": rows + 1,
+        "Field": np.repeat([f for _, f, _ in found], [len(r) for r, _, _ in found]),
+        "Error": np.repeat([m for _, _, m in found], [len(r) for r, _, _ in found]),
+    })
+    return errors.sort_values("Row", kind="stable", ignore_index=True)[ERROR_COLUMNS]